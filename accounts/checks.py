@@ -0,0 +1,27 @@
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+from rest_framework.settings import api_settings
+
+from core.authentication import StatelessJWTAuthentication
+
+
+@register(Tags.caches, deploy=True)
+def check_revocations_are_shared(app_configs, **kwargs):
+    """
+    Revocations (accounts.revocation) live in the default cache. A per-process
+    cache only tells the worker that handled the change, and every other worker
+    keeps accepting the user's tokens until they expire.
+    """
+    stateless = any(issubclass(cls, StatelessJWTAuthentication) for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES)
+    if not stateless or not isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return []
+    return [
+        Error(
+            "StatelessJWTAuthentication keeps token revocations in the default cache, which is not shared "
+            "between worker processes.",
+            hint="Set CACHE_DIR to a directory all workers can write (or configure another shared cache).",
+            id="accounts.E001",
+        )
+    ]
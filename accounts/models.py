@@ -48,5 +48,12 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     EMAIL_FIELD = "email"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        # Lets accounts.signals tell a role change apart from other saves.
+        user._loaded_role = user.__dict__.get("role")
+        return user
+
     def __str__(self):
         return self.email
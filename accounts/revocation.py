@@ -0,0 +1,30 @@
+"""
+Revocation list for stateless JWT authentication.
+
+Stateless auth trusts the ``role`` claim without reading the user row, so any
+change that should end existing sessions (deactivation, role change, deletion)
+records a revocation time here. Tokens issued before it are rejected until
+they would have expired anyway. ``iat`` has whole-second precision, so the
+revocation is stored in whole seconds too: a token issued in the same second
+(e.g. on the login right after a role change) is accepted.
+
+The default cache must be shared by every worker process (``CACHE_DIR``);
+``manage.py check --deploy`` fails on a per-process one (accounts.checks).
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "jwt-revoked:"
+
+
+def revoke(user_id):
+    lifetime = max(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"], settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"])
+    cache.set(f"{KEY_PREFIX}{user_id}", int(time.time()), timeout=int(lifetime.total_seconds()))
+
+
+def is_revoked(user_id, issued_at):
+    revoked_at = cache.get(f"{KEY_PREFIX}{user_id}")
+    return revoked_at is not None and issued_at < revoked_at
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .revocation import revoke
+
+
+@receiver(post_save, sender=User)
+def revoke_on_access_change(sender, instance, created, **kwargs):
+    if created:
+        return
+    if not instance.is_active or instance.role != getattr(instance, "_loaded_role", instance.role):
+        revoke(instance.pk)
+    instance._loaded_role = instance.role
+
+
+@receiver(post_delete, sender=User)
+def revoke_on_delete(sender, instance, **kwargs):
+    revoke(instance.pk)
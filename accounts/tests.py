@@ -1,3 +1,119 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.jwt_serializers import CustomTokenObtainPairSerializer
+from core.throttling import LoginAccountThrottle, LoginIPThrottle
+from .checks import check_revocations_are_shared
+from .models import User
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="manager@test.com", password="test", role=User.Role.MANAGER)
+
+    def authenticate(self, user, issued_ago=0):
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        token["iat"] -= issued_ago  # revocations have whole-second precision, like iat
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_role_permission_without_user_query(self):
+        self.authenticate(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/employee-status-choices/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_role_claim_drives_permissions(self):
+        employee = User.objects.create_user(email="employee@test.com", password="test", role=User.Role.EMPLOYEE)
+        self.authenticate(employee)
+        self.assertEqual(self.client.get("/api/employees/").status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate(self.user, issued_ago=1)
+        self.assertEqual(self.client.get("/api/employees/").status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/employees/").status_code, 401)
+
+    def test_role_change_revokes_existing_tokens(self):
+        self.authenticate(self.user, issued_ago=1)
+        user = User.objects.get(pk=self.user.pk)
+        user.role = User.Role.EMPLOYEE
+        user.save()
+        self.assertEqual(self.client.get("/api/employee-status-choices/").status_code, 401)
+
+    def test_token_issued_right_after_revocation_is_accepted(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.role = User.Role.EMPLOYEE
+        user.save()
+        self.authenticate(user)
+        self.assertEqual(self.client.get("/api/employee-status-choices/").status_code, 200)
+
+    def test_unrelated_save_keeps_tokens(self):
+        self.authenticate(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        user.username = "renamed"
+        user.save()
+        self.assertEqual(self.client.get("/api/employee-status-choices/").status_code, 200)
+
+    def test_deploy_check_requires_a_shared_cache(self):
+        self.assertEqual([error.id for error in check_revocations_are_shared(None)], ["accounts.E001"])
+        with tempfile.TemporaryDirectory() as directory:
+            shared = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}}
+            with override_settings(CACHES=shared):
+                self.assertEqual(check_revocations_are_shared(None), [])
+
+    def test_current_user_view_reads_database_user(self):
+        User.objects.filter(pk=self.user.pk).update(username="mgr")
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get("/me/").data["username"], "mgr")
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class LoginTests(APITestCase):
+    url = "/api/auth/login/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="manager@test.com", password="test", role=User.Role.MANAGER)
+
+    def login(self, email="manager@test.com", password="test", ip="10.0.0.1"):
+        return self.client.post(self.url, {"email": email, "password": password}, REMOTE_ADDR=ip)
+
+    def test_rehashes_on_login_when_cost_changes(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+        self.assertEqual(self.login().status_code, 200)
+
+    @mock.patch.object(LoginAccountThrottle, "rate", "2/min", create=True)
+    def test_account_throttle_rejects_before_hashing(self):
+        self.login(password="wrong", ip="10.0.0.1")
+        self.login(password="wrong", ip="10.0.0.2")
+        with mock.patch("django.contrib.auth.hashers.PBKDF2PasswordHasher.encode") as encode:
+            response = self.login(email="Manager@test.com", ip="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+        encode.assert_not_called()
+
+    @mock.patch.object(LoginIPThrottle, "rate", "2/min", create=True)
+    def test_ip_throttle(self):
+        self.login(email="a@test.com")
+        self.login(email="b@test.com")
+        self.assertEqual(self.login(email="c@test.com").status_code, 429)
+        self.assertEqual(self.login(ip="10.0.0.9").status_code, 200)
+
+    @mock.patch.object(LoginIPThrottle, "rate", "2/min", create=True)
+    def test_ip_throttle_ignores_spoofed_forwarded_for(self):
+        for n in range(2):
+            self.client.post(self.url, {"email": f"{n}@test.com", "password": "x"}, HTTP_X_FORWARDED_FOR=f"203.0.113.{n}")
+        response = self.client.post(self.url, {"email": "z@test.com", "password": "x"}, HTTP_X_FORWARDED_FOR="203.0.113.9")
+        self.assertEqual(response.status_code, 429)
@@ -9,6 +9,7 @@ from django.views.generic import CreateView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from .serializers import UserSerializer
 
 UserModel = get_user_model()
@@ -46,6 +47,8 @@ class CustomLoginView(LoginView):
 
 
 class CurrentUserView(APIView):
+    # Needs the full user row (username is not a token claim), so authenticate against the database.
+    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -0,0 +1,207 @@
+"""
+Benchmark every route in core/api_urls.py at several dataset sizes.
+
+For each route this records p50/p95 latency, SQL query count and peak Python
+heap, and writes a JSON report. Pass an older report with --compare to flag
+regressions (exit status 1).
+
+Usage:
+    python -m benchmarks.api --sizes 1000,10000 --output bench.json
+    python -m benchmarks.api --sizes 1000,10000 --compare bench.json
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import platform
+import subprocess
+import sys
+
+from benchmarks.common import api_client, consume, count_queries, measure, peak_memory, test_database
+import django
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.loadgen import generate
+from core.models import Company, Department, Employee
+from core.throttling import LoginAccountThrottle, LoginIPThrottle
+
+PASSWORD = "bench-password"
+PAGE_SIZE = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+
+def build_cases(repeat, warmup):
+    # Measure the login itself, not the throttle rejecting the repeated attempts.
+    LoginIPThrottle.rate = LoginAccountThrottle.rate = "1000000/min"
+    client = api_client(jwt=True)
+    anonymous = APIClient()
+    User.objects.create_user(email="bench-login@example.com", password=PASSWORD, role=User.Role.MANAGER)
+    refresh = anonymous.post("/api/auth/login/", {"email": "bench-login@example.com", "password": PASSWORD}).data["refresh"]
+
+    big_company = Company.objects.order_by("-num_employees").first()
+    big_department = Department.objects.order_by("-num_employees").first()
+    small_company = Company.objects.order_by("num_employees", "id").first()
+    small_department = Department.objects.filter(company=small_company).first()
+    employee = Employee.objects.order_by("id").first()
+    # Last page as of now; rows created by the write cases only add pages.
+    company_last_page = max(1, -(-Company.objects.count() // PAGE_SIZE))
+    employee_last_page = max(1, -(-Employee.objects.count() // PAGE_SIZE))
+    seq = itertools.count()
+    # Timed calls plus the status check, query count and memory passes in run_size().
+    calls = repeat + warmup + 3
+
+    def employee_row():
+        i = next(seq)
+        return {
+            "company": small_company.pk,
+            "department": small_department.pk,
+            "name": f"Bench Employee {i}",
+            "email": f"bench{i}@example.com",
+            "mobile": f"+1999{i:07d}",
+            "designation": "Engineer",
+        }
+
+    def pool(create):
+        """Objects created up front so each timed delete has its own target."""
+        items = [create(i) for i in range(calls)]
+        return lambda: items.pop()
+
+    next_company = pool(lambda i: Company.objects.create(name=f"Doomed Co {i}"))
+    next_department = pool(lambda i: Department.objects.create(company=small_company, name=f"Doomed Dept {i}"))
+    next_employee = pool(lambda i: Employee.objects.create(
+        company=small_company, department=small_department, name=f"Doomed {i}",
+        email=f"doomed{i}@example.com", mobile=f"+1888{i:07d}", designation="Clerk",
+    ))
+
+    def dashboard_cold():
+        cache.clear()
+        return client.get("/api/dashboard-stats/")
+
+    return {
+        "companies.list": lambda: client.get("/api/companies/"),
+        "companies.list_deep": lambda: client.get(f"/api/companies/?page={company_last_page}"),
+        "companies.all": lambda: consume(client.get("/api/companies/all/")),
+        "companies.retrieve": lambda: client.get(f"/api/companies/{big_company.pk}/"),
+        "companies.create": lambda: client.post("/api/companies/", {"name": f"Bench Co {next(seq)}"}),
+        "companies.update": lambda: client.patch(f"/api/companies/{small_company.pk}/", {"name": f"Small Co {next(seq)}"}),
+        "companies.delete": lambda: client.delete(f"/api/companies/{next_company().pk}/"),
+        "departments.list": lambda: client.get("/api/departments/"),
+        "departments.list_by_company": lambda: client.get(f"/api/departments/?company={big_company.pk}"),
+        "departments.all": lambda: consume(client.get("/api/departments/all/")),
+        "departments.retrieve": lambda: client.get(f"/api/departments/{big_department.pk}/"),
+        "departments.create": lambda: client.post(
+            "/api/departments/", {"company": small_company.pk, "name": f"Bench Dept {next(seq)}"}
+        ),
+        "departments.update": lambda: client.patch(
+            f"/api/departments/{small_department.pk}/", {"name": f"Small Dept {next(seq)}"}
+        ),
+        "departments.delete": lambda: client.delete(f"/api/departments/{next_department().pk}/"),
+        "employees.list": lambda: client.get("/api/employees/"),
+        "employees.list_deep": lambda: client.get(f"/api/employees/?page={employee_last_page}"),
+        "employees.list_cursor": lambda: client.get("/api/employees/?cursor="),
+        "employees.all": lambda: consume(client.get("/api/employees/all/")),
+        "employees.export": lambda: consume(client.get("/api/employees/export/", HTTP_ACCEPT="text/csv")),
+        "employees.retrieve": lambda: client.get(f"/api/employees/{employee.pk}/"),
+        "employees.create": lambda: client.post("/api/employees/", employee_row()),
+        "employees.update": lambda: client.patch(f"/api/employees/{employee.pk}/", {"designation": f"Lead {next(seq)}"}),
+        "employees.delete": lambda: client.delete(f"/api/employees/{next_employee().pk}/"),
+        "employees.bulk_100": lambda: client.post(
+            "/api/employees/bulk/", [employee_row() for _ in range(100)], format="json"
+        ),
+        "employee-status-choices": lambda: client.get("/api/employee-status-choices/"),
+        "dashboard-stats": lambda: client.get("/api/dashboard-stats/"),
+        "dashboard-stats.cold": dashboard_cold,
+        "auth.login": lambda: anonymous.post(
+            "/api/auth/login/", {"email": "bench-login@example.com", "password": PASSWORD}
+        ),
+        "auth.refresh": lambda: anonymous.post("/api/auth/token/refresh/", {"refresh": refresh}),
+    }
+
+
+def run_size(size, repeat, warmup, only):
+    generate(max(10, size // 100), size, seed=0, log=lambda message: None)
+    results = {}
+    for name, call in build_cases(repeat, warmup).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        response = call()
+        if response.status_code >= 400:
+            raise RuntimeError(f"{name} returned {response.status_code}: {getattr(response, 'data', '')}")
+        result = measure(call, repeat=repeat, warmup=warmup)
+        result["queries"] = count_queries(call)
+        result["peak_mib"] = peak_memory(call)
+        results[name] = result
+        print(f"  {name:<30} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+              f"{result['queries']:>3} queries  {result['peak_mib']:>8.2f} MiB", file=sys.stderr)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(old, new, threshold):
+    """Return regressions: p50 slower by more than ``threshold`` or more queries than before."""
+    regressions = []
+    for size, cases in new["results"].items():
+        for name, result in cases.items():
+            before = old.get("results", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if result["queries"] > before["queries"]:
+                regressions.append(f"{size}/{name}: queries {before['queries']} -> {result['queries']}")
+            if result["p50_ms"] > before["p50_ms"] * (1 + threshold):
+                regressions.append(f"{size}/{name}: p50 {before['p50_ms']} ms -> {result['p50_ms']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated employee counts.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", default="", help="Comma-separated route name prefixes, e.g. employees,auth.")
+    parser.add_argument("--output", help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--compare", help="Previous JSON report to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown ratio (default 0.25).")
+    args = parser.parse_args()
+
+    only = [prefix for prefix in args.only.split(",") if prefix]
+    logging.disable(logging.INFO)  # per-request export throughput lines would drown the table
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in [int(size) for size in args.sizes.split(",")]:
+        print(f"{size} employees", file=sys.stderr)
+        with test_database():
+            report["results"][str(size)] = run_size(size, args.repeat, args.warmup, only)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
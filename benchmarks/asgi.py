@@ -0,0 +1,131 @@
+"""
+Concurrent-request throughput of the read endpoints, three ways:
+
+- wsgi: the DRF views behind Django's WSGI handler, one thread per concurrent request
+  (what a threaded WSGI server does);
+- asgi-sync: the same DRF views behind the ASGI handler, which runs them in its thread pool;
+- asgi-async: the /api/async/ views behind the ASGI handler, on the async ORM.
+
+Requests go through Django's in-process test clients with a real JWT, so
+server and network overhead are excluded. ``--db-latency-ms`` adds a sleep
+to every query to stand in for a networked database.
+
+Usage:
+    python -m benchmarks.asgi [--employees 10000] [--requests 400] [--concurrency 1,16] [--db-latency-ms 0,2]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import seed, test_database
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+
+from accounts.models import User
+from core.jwt_serializers import CustomTokenObtainPairSerializer
+from core.models import Company, Employee
+
+MODES = ["wsgi", "asgi-sync", "asgi-async"]
+
+
+def routes():
+    company = Company.objects.order_by("id").first()
+    employee = Employee.objects.order_by("id").first()
+    return [
+        "/api/companies/",
+        f"/api/companies/{company.pk}/",
+        "/api/departments/",
+        "/api/employees/",
+        f"/api/employees/?company={company.pk}&page=2",
+        f"/api/employees/{employee.pk}/",
+        "/api/employee-status-choices/",
+        "/api/dashboard-stats/",
+    ]
+
+
+def run_wsgi(urls, headers, concurrency):
+    def call(url):
+        response = Client(headers=headers).get(url)
+        assert response.status_code == 200, (url, response.status_code)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(call, urls))
+
+
+async def run_asgi(urls, headers, concurrency):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(url):
+        async with semaphore:
+            # AsyncClient(headers=...) puts client-wide headers in the ASGI scope, not the request headers.
+            response = await client.get(url, headers=headers)
+        assert response.status_code == 200, (url, response.status_code)
+
+    await asyncio.gather(*(call(url) for url in urls))
+
+
+def throughput(mode, urls, headers, concurrency):
+    if mode == "asgi-async":
+        urls = [url.replace("/api/", "/api/async/", 1) for url in urls]
+    start = time.perf_counter()
+    if mode == "wsgi":
+        run_wsgi(urls, headers, concurrency)
+    else:
+        asyncio.run(run_asgi(urls, headers, concurrency))
+    return round(len(urls) / (time.perf_counter() - start), 1)
+
+
+# Seconds to sleep before each query; read at execution time so it applies to every thread's connection.
+db_latency = 0.0
+
+
+def sleep_then_execute(execute, sql, params, many, context):
+    if db_latency:
+        time.sleep(db_latency)
+    return execute(sql, params, many, context)
+
+
+def add_latency_wrapper(sender, connection, **kwargs):
+    connection.execute_wrappers.append(sleep_then_execute)
+
+
+def run(num_employees, num_requests, concurrency_levels, latencies):
+    global db_latency
+    connection_created.connect(add_latency_wrapper)
+    for connection in connections.all(initialized_only=True):
+        connection.execute_wrappers.append(sleep_then_execute)
+    seed(num_companies=50, departments_per_company=5, num_employees=num_employees)
+    user, _ = User.objects.get_or_create(email="bench-admin@example.com", defaults={"role": User.Role.ADMIN})
+    headers = {"Authorization": f"Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}"}
+    paths = routes()
+    urls = [paths[i % len(paths)] for i in range(num_requests)]
+    results = {}
+    for latency in latencies:
+        db_latency = latency / 1000
+        for concurrency in concurrency_levels:
+            key = f"latency={latency}ms concurrency={concurrency}"
+            results[key] = {mode: throughput(mode, urls, headers, concurrency) for mode in MODES}
+    db_latency = 0.0
+    return {"employees": num_employees, "requests": num_requests, "requests_per_second": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,16")
+    parser.add_argument("--db-latency-ms", default="0,2")
+    args = parser.parse_args()
+    concurrency = [int(level) for level in args.concurrency.split(",")]
+    latencies = [float(latency) for latency in args.db_latency_ms.split(",")]
+    with test_database():
+        print(json.dumps(run(args.employees, args.requests, concurrency, latencies), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Request throughput of EmployeeViewSet.list with database-backed JWT
+authentication versus the stateless token-claims authentication.
+
+Usage:
+    python -m benchmarks.auth [--employees 10000] [--requests 500]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import api_client, count_queries, seed, test_database
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core.authentication import StatelessJWTAuthentication
+from core.views import EmployeeViewSet
+
+
+def throughput(client, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get("/api/employees/")
+    elapsed = time.perf_counter() - start
+    return {"requests_per_second": round(requests / elapsed, 1), "ms_per_request": round(elapsed / requests * 1000, 3)}
+
+
+def run(num_employees, requests):
+    seed(num_companies=20, departments_per_company=5, num_employees=num_employees)
+    client = api_client(jwt=True)
+    results = {}
+    original = EmployeeViewSet.authentication_classes
+    try:
+        for name, authentication in (("database", JWTAuthentication), ("stateless", StatelessJWTAuthentication)):
+            EmployeeViewSet.authentication_classes = [authentication]
+            client.get("/api/employees/")
+            results[name] = throughput(client, requests)
+            results[name]["queries"] = count_queries(lambda: client.get("/api/employees/"))
+    finally:
+        EmployeeViewSet.authentication_classes = original
+    results["speedup"] = round(results["stateless"]["requests_per_second"] / results["database"]["requests_per_second"], 3)
+    return {"employees": num_employees, "requests": requests, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees, args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Cold start: seconds from launching a server process to its first successful
+response, checked against a budget.
+
+Each run starts a fresh server on a free port and polls the prebuilt OpenAPI
+schema, which needs no database, until it answers 200. Servers:
+
+- wsgi / asgi: the production mode (``startup.sh serve``: gunicorn with gunicorn.conf.py);
+- runserver: the development server, as the old image CMD ran it.
+
+``--cold-bytecode`` points every run at an empty bytecode cache, as in an image
+built without precompiled .pyc files. Exits 1 if the median cold start of any
+server is over ``--budget`` (default COLD_START_BUDGET_SECONDS, 5).
+
+Usage:
+    python -m benchmarks.coldstart [--servers wsgi,asgi,runserver] [--runs 5] [--budget 5] [--cold-bytecode]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROBE_PATH = "/swagger/?format=openapi"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def command(server, port):
+    if server == "runserver":
+        return [sys.executable, "manage.py", "runserver", f"127.0.0.1:{port}"]
+    return [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"]
+
+
+def cold_start(server, timeout, cold_bytecode):
+    port = free_port()
+    env = {**os.environ, "SERVER_MODE": server, "BIND": f"127.0.0.1:{port}"}
+    with tempfile.TemporaryDirectory() as pycache, tempfile.TemporaryDirectory() as cache_dir:
+        env.setdefault("CACHE_DIR", cache_dir)  # production mode refuses a per-process cache
+        if cold_bytecode:
+            env["PYTHONPYCACHEPREFIX"] = pycache
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            command(server, port), cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while time.perf_counter() - start < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"{server} exited with code {process.returncode} before serving")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{PROBE_PATH}", timeout=1) as response:
+                        if response.status == 200:
+                            return time.perf_counter() - start
+                except (urllib.error.URLError, ConnectionError):
+                    time.sleep(0.02)
+            raise RuntimeError(f"{server} did not answer within {timeout}s")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servers", default="wsgi,asgi,runserver")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("COLD_START_BUDGET_SECONDS", 5)))
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--cold-bytecode", action="store_true")
+    args = parser.parse_args()
+
+    report, over_budget = {}, []
+    for server in args.servers.split(","):
+        samples = [cold_start(server, args.timeout, args.cold_bytecode) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        report[server] = {"p50_s": round(median, 3), "max_s": round(max(samples), 3)}
+        if median > args.budget:
+            over_budget.append(server)
+    print(json.dumps({"budget_s": args.budget, "cold_bytecode": args.cold_bytecode, "cold_start": report}, indent=2))
+    if over_budget:
+        print(f"Over the {args.budget}s cold-start budget: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Shared helpers for the benchmark scripts in this package.
+
+Benchmarks run offline against a throwaway SQLite test database, so they never
+touch ``db.sqlite3``. Run them from the project root, e.g.:
+    python -m benchmarks.pagination
+"""
+
+import os
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "employee_mgmt.settings")
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core import conditional, search
+from core.counters import recount
+from core.jwt_serializers import CustomTokenObtainPairSerializer
+from core.models import Company, Department, Employee
+
+
+@contextmanager
+def test_database():
+    """Create a fresh test database for the duration of the block."""
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    cache.clear()
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed(num_companies, departments_per_company, num_employees, batch_size=5000):
+    """Bulk insert a uniform dataset; returns the number of employees created."""
+    companies = Company.objects.bulk_create([Company(name=f"Company {i}") for i in range(num_companies)])
+    departments = Department.objects.bulk_create(
+        [
+            Department(company=company, name=f"Department {j}")
+            for company in companies
+            for j in range(departments_per_company)
+        ]
+    )
+    batch = []
+    for i in range(num_employees):
+        dept = departments[i % len(departments)]
+        batch.append(
+            Employee(
+                company_id=dept.company_id,
+                department=dept,
+                name=f"Employee {i}",
+                email=f"employee{i}@example.com",
+                mobile=f"+1555{i:07d}",
+                designation="Engineer",
+            )
+        )
+        if len(batch) >= batch_size:
+            Employee.objects.bulk_create(batch)
+            batch = []
+    Employee.objects.bulk_create(batch)
+    recount()  # bulk_create bypasses the counter, search and table version signals
+    search.rebuild()
+    conditional.bump(Company, Department, Employee)
+    return num_employees
+
+
+def api_client(role=User.Role.ADMIN, jwt=False):
+    """
+    Client for a user with ``role``. With ``jwt`` the client sends a real Bearer
+    token, so authentication cost is part of the measurement.
+    """
+    user, _ = User.objects.get_or_create(email=f"bench-{role.lower()}@example.com", defaults={"role": role})
+    client = APIClient()
+    if jwt:
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    else:
+        client.force_authenticate(user=user)
+    return client
+
+
+def measure(fn, repeat=20, warmup=2):
+    """Call ``fn`` repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def count_queries(fn):
+    """Return the number of SQL queries issued by a single call to ``fn``."""
+    reset_queries()
+    with CaptureQueriesContext(connection) as ctx:
+        fn()
+    return len(ctx.captured_queries)
+
+
+def peak_memory(fn):
+    """Return the peak Python heap allocation (MiB) during a single call to ``fn``."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 2**20, 3)
+
+
+def consume(response):
+    """Read a (possibly streaming) response to the end so timings include the whole body."""
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
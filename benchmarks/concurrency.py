@@ -0,0 +1,129 @@
+"""
+Mixed read/write throughput from several worker processes sharing one SQLite
+file, once with SQLite's defaults and once with the tuned profile.
+
+"default" is the old setup: rollback journal, synchronous=FULL, deferred
+transactions and a new connection per request. "tuned" is the shipped
+settings: WAL and the SQLITE_PROFILES pragmas, BEGIN IMMEDIATE and
+persistent connections. Each worker closes its connection after every
+request the way a WSGI server does, subject to CONN_MAX_AGE.
+
+Usage:
+    python -m benchmarks.concurrency [--workers 4] [--seconds 10] [--write-ratio 0.2]
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import api_client, seed
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, close_old_connections, connection
+from django.test.utils import setup_test_environment
+
+from core.models import Department
+
+PROFILES = {
+    "default": {"pragmas": "default", "transaction_mode": "DEFERRED", "conn_max_age": 0},
+    "tuned": {"pragmas": "tuned", "transaction_mode": "IMMEDIATE", "conn_max_age": 60},
+}
+
+
+def use_profile(path, profile):
+    connection.close()
+    settings.SQLITE_PROFILE = profile["pragmas"]
+    connection.settings_dict["NAME"] = str(path)
+    connection.settings_dict["CONN_MAX_AGE"] = profile["conn_max_age"]
+    connection.settings_dict["OPTIONS"] = {
+        **connection.settings_dict.get("OPTIONS", {}), "transaction_mode": profile["transaction_mode"],
+    }
+
+
+def worker(args):
+    index, seconds, write_ratio, num_companies = args
+    rng = random.Random(index)
+    client = api_client()
+    company_id = (index % num_companies) + 1
+    department_id = Department.objects.filter(company_id=company_id).values_list("pk", flat=True).first()
+    reads, writes, locked = [], [], 0
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    while time.perf_counter() < deadline:
+        write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            if write:
+                sequence += 1
+                response = client.post("/api/employees/", {
+                    "company": company_id, "department": department_id, "name": f"Worker {index} #{sequence}",
+                    "email": f"w{index}-{sequence}@example.com", "mobile": f"+1{3000000000 + index * 10**6 + sequence}",
+                    "designation": "Engineer",
+                })
+            else:
+                response = client.get("/api/employees/", {"page": rng.randint(1, 20)})
+            assert response.status_code < 400, response.status_code
+            (writes if write else reads).append((time.perf_counter() - start) * 1000)
+        except OperationalError:
+            locked += 1  # "database is locked"
+        close_old_connections()
+    connection.close()
+    return reads, writes, locked
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 2) if samples else None
+
+
+def run(profile_name, workers, seconds, write_ratio, num_employees):
+    profile = PROFILES[profile_name]
+    with tempfile.TemporaryDirectory() as directory:
+        use_profile(Path(directory) / "bench.sqlite3", profile)
+        call_command("migrate", run_syncdb=True, verbosity=0)
+        num_companies = 10
+        seed(num_companies=num_companies, departments_per_company=5, num_employees=num_employees)
+        api_client()  # create the user before the workers race to do it
+        cache.clear()
+        connection.close()  # children must open their own connections
+
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            results = pool.map(worker, [(i, seconds, write_ratio, num_companies) for i in range(workers)])
+    reads = [sample for result in results for sample in result[0]]
+    writes = [sample for result in results for sample in result[1]]
+    return {
+        "requests_per_second": round((len(reads) + len(writes)) / seconds, 1),
+        "reads_per_second": round(len(reads) / seconds, 1),
+        "writes_per_second": round(len(writes) / seconds, 1),
+        "read_p50_ms": round(statistics.median(reads), 2) if reads else None,
+        "read_p95_ms": percentile(reads, 0.95),
+        "write_p50_ms": round(statistics.median(writes), 2) if writes else None,
+        "write_p95_ms": percentile(writes, 0.95),
+        "database_locked_errors": sum(result[2] for result in results),
+    }
+
+
+def main():
+    setup_test_environment()  # lets the test client's "testserver" host through ALLOWED_HOSTS
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--profiles", default="default,tuned")
+    args = parser.parse_args()
+    report = {
+        name: run(name, args.workers, args.seconds, args.write_ratio, args.employees)
+        for name in args.profiles.split(",")
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
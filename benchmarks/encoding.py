@@ -0,0 +1,71 @@
+"""
+JSON encode time per backend and bytes on the wire per encoding for the
+largest responses:
+
+- ``/api/employees/all/``: every employee, streamed;
+- ``/api/companies/<id>/``: a company with all its departments and employees;
+- ``/api/employees/``: one list page, for scale.
+
+For each response, "encode" is the time ``core.jsoncodec`` takes to encode
+its data with the stdlib and orjson backends, next to DRF's JSONRenderer. "wire" is
+the body size and the full request time with no compression, gzip, and
+brotli (if installed) through CompressionMiddleware.
+
+Usage:
+    python -m benchmarks.encoding [--employees 100000] [--repeat 5]
+"""
+
+import argparse
+import json
+
+from benchmarks.common import api_client, measure, seed, test_database  # configures Django; keep first
+from rest_framework.renderers import JSONRenderer
+from core import compression, jsoncodec
+from core.models import Company
+
+URLS = {
+    "employees_all": "/api/employees/all/",
+    "company_detail": "/api/companies/{company}/",
+    "employee_page": "/api/employees/",
+}
+
+
+def body(response):
+    return b"".join(response.streaming_content) if response.streaming else response.content
+
+
+def run(num_employees, repeat):
+    seed(num_companies=20, departments_per_company=5, num_employees=num_employees)
+    client = api_client()
+    company = Company.objects.order_by("pk").first()
+    backends = {"drf": JSONRenderer().render, "stdlib": jsoncodec.StdlibBackend().dumps}
+    if jsoncodec.orjson is not None:
+        backends["orjson"] = jsoncodec.OrjsonBackend().dumps
+    encodings = ["identity", *[name for name in ("gzip", "br") if name in compression.COMPRESSORS]]
+
+    report = {}
+    for name, url in URLS.items():
+        url = url.format(company=company.pk)
+        data = json.loads(body(client.get(url)))
+        encode = {backend: measure(lambda: dumps(data), repeat=repeat, warmup=1)["p50_ms"] for backend, dumps in backends.items()}
+        wire = {}
+        for encoding in encodings:
+            response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+            assert response.get("Content-Encoding", "identity") == encoding, (url, encoding)
+            timing = measure(lambda: body(client.get(url, HTTP_ACCEPT_ENCODING=encoding)), repeat=repeat, warmup=1)
+            wire[encoding] = {"bytes": len(body(response)), "request_ms": timing["p50_ms"]}
+        report[name] = {"encode_ms": encode, "wire": wire}
+    return {"employees": num_employees, "json_backend": jsoncodec.backend.name, "results": report}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
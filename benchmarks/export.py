@@ -0,0 +1,51 @@
+"""
+Throughput and peak memory of the streaming employee CSV export.
+
+Usage:
+    python -m benchmarks.export [--employees 1000000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import api_client, seed, test_database
+
+
+def run(num_employees):
+    seed(num_companies=100, departments_per_company=10, num_employees=num_employees)
+    client = api_client()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get("/api/employees/export/", HTTP_ACCEPT="text/csv")
+    rows = size = 0
+    for chunk in response.streaming_content:
+        rows += 1
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows -= 1  # header
+
+    return {
+        "employees": num_employees,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed),
+        "megabytes": round(size / 2**20, 2),
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees), indent=2))
+
+
+if __name__ == "__main__":
+    main()
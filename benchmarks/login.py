@@ -0,0 +1,68 @@
+"""
+Login throughput per core at several PBKDF2 work factors, and the cost of
+rejecting a throttled login flood.
+
+Logins run sequentially in one process, so logins/s is per core.
+
+Usage:
+    python -m benchmarks.login [--iterations 1000000,600000,100000] [--logins 20]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import test_database
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.throttling import LoginAccountThrottle, LoginIPThrottle
+
+EMAIL, PASSWORD = "bench-login@example.com", "bench-password"
+
+
+def logins_per_second(client, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.post("/api/auth/login/", {"email": EMAIL, "password": PASSWORD})
+        assert response.status_code == 200, response.status_code
+    return round(count / (time.perf_counter() - start), 2)
+
+
+def rejected_per_second(client, count):
+    cache.clear()
+    LoginAccountThrottle.rate = "1/min"
+    client.post("/api/auth/login/", {"email": EMAIL, "password": "wrong"})
+    start = time.perf_counter()
+    for _ in range(count):
+        assert client.post("/api/auth/login/", {"email": EMAIL, "password": "wrong"}).status_code == 429
+    return round(count / (time.perf_counter() - start), 1)
+
+
+def run(iteration_levels, count):
+    client = APIClient()
+    User.objects.create_user(email=EMAIL, password=PASSWORD)
+    LoginIPThrottle.rate = LoginAccountThrottle.rate = "1000000/min"
+    results = {}
+    for iterations in iteration_levels:
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=iterations):
+            # The first login rehashes the stored password to the new cost.
+            client.post("/api/auth/login/", {"email": EMAIL, "password": PASSWORD})
+            results[str(iterations)] = {"logins_per_second_per_core": logins_per_second(client, count)}
+    results["throttled_rejections_per_second"] = rejected_per_second(client, count * 50)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", default="1000000,600000,100000")
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run([int(i) for i in args.iterations.split(",")], args.logins), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Page-number vs keyset (cursor) pagination latency at shallow and deep pages.
+
+Usage:
+    python -m benchmarks.pagination [--employees 200000] [--repeat 20]
+"""
+
+import argparse
+import json
+from base64 import b64encode
+from urllib.parse import urlencode
+
+from django.conf import settings
+from benchmarks.common import api_client, count_queries, measure, seed, test_database
+from core.models import Employee
+
+
+def encode_cursor(position):
+    return b64encode(urlencode({"p": position}).encode("ascii")).decode("ascii")
+
+
+def run(num_employees, repeat):
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    seed(num_companies=50, departments_per_company=10, num_employees=num_employees)
+    client = api_client()
+
+    deep_page = max(1, num_employees // page_size)
+    # The cursor for page N points at the last id shown on page N - 1.
+    ids = Employee.objects.order_by("-id").values_list("id", flat=True)
+    deep_position = ids[(deep_page - 1) * page_size - 1] if deep_page > 1 else None
+
+    cases = {
+        "page_number_first": "/api/employees/?page=1",
+        "page_number_deep": f"/api/employees/?page={deep_page}",
+        "cursor_first": "/api/employees/?cursor=",
+        "cursor_deep": f"/api/employees/?cursor={encode_cursor(deep_position)}" if deep_position else "/api/employees/?cursor=",
+    }
+    report = {"employees": num_employees, "deep_page": deep_page, "results": {}}
+    for name, url in cases.items():
+        fetch = lambda: client.get(url)
+        assert fetch().status_code == 200, url
+        result = measure(fetch, repeat=repeat)
+        result["queries"] = count_queries(fetch)
+        report["results"][name] = result
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Latency of ``?search=`` on the employees list: FTS5 index vs the icontains scan it replaces.
+
+Usage:
+    python -m benchmarks.search [--employees 200000]
+"""
+
+import argparse
+import json
+from unittest import mock
+
+from benchmarks.common import api_client, measure, seed, test_database
+
+QUERIES = ["emp", "employee 1999", "engineer", "company 7 department"]
+
+
+def run(num_employees, repeat):
+    seed(num_companies=100, departments_per_company=10, num_employees=num_employees)
+    client = api_client()
+    results = {"employees": num_employees}
+    for label, fts in (("fts5", True), ("icontains", False)):
+        with mock.patch("core.search.enabled", return_value=fts):
+            results[label] = {
+                text: measure(lambda: client.get("/api/employees/", {"search": text}), repeat=repeat)["p50_ms"]
+                for text in QUERIES
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
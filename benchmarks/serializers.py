@@ -0,0 +1,75 @@
+"""
+Rows per second of the read-only fast path (``core.fastpath``) against the
+regular ``ModelSerializer``, for each list serializer, from query to rendered
+JSON. Both produce the same bytes; the script checks this before timing.
+
+Usage:
+    python -m benchmarks.serializers [--sizes 10000,100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import seed, test_database  # configures Django; keep first
+from rest_framework.renderers import JSONRenderer
+from core.fastpath import compile_serializer
+from core.models import Company, Department, Employee
+from core.serializers import CompanySerializer, DepartmentSerializer, EmployeeSerializer
+
+QUERYSETS = {
+    "employees": (EmployeeSerializer, lambda: Employee.objects.select_related("company", "department")),
+    "departments": (DepartmentSerializer, lambda: Department.objects.select_related("company")),
+    "companies": (CompanySerializer, lambda: Company.objects.all()),
+}
+
+
+def best_rate(fn, rows, repeat):
+    best = min(timed(fn) for _ in range(repeat))
+    return {"ms": round(best * 1000, 1), "rows_per_s": round(rows / best)}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(num_employees, repeat):
+    seed(num_companies=20, departments_per_company=5, num_employees=num_employees)
+    report = {}
+    for name, (serializer_class, queryset) in QUERYSETS.items():
+        fast = compile_serializer(serializer_class)
+
+        def regular():
+            return JSONRenderer().render(serializer_class(queryset(), many=True).data)
+
+        def fastpath():
+            return JSONRenderer().render(fast.rows(fast.values(queryset())))
+
+        assert regular() == fastpath(), f"{name}: fast path output differs"
+        rows = queryset().count()
+        slow, quick = best_rate(regular, rows, repeat), best_rate(fastpath, rows, repeat)
+        report[name] = {
+            "rows": rows,
+            "serializer": slow,
+            "fastpath": quick,
+            "speedup": round(quick["rows_per_s"] / slow["rows_per_s"], 2),
+        }
+    return {"employees": num_employees, "results": report}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    reports = []
+    for size in map(int, args.sizes.split(",")):
+        with test_database():
+            reports.append(run(size, args.repeat))
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
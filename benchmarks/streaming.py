@@ -0,0 +1,69 @@
+"""
+Time-to-first-byte and peak memory of the streaming ``all`` endpoints, compared
+with serializing the whole queryset in one go (the previous implementation).
+
+Usage:
+    python -m benchmarks.streaming [--employees 100000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import api_client, seed, test_database  # configures Django; keep first
+from rest_framework.renderers import JSONRenderer
+from core.models import Employee
+from core.serializers import EmployeeSerializer
+
+
+def profile(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_byte_ms = fn(start)
+    total_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ttfb_ms": round(first_byte_ms, 3), "total_ms": round(total_ms, 3), "peak_mib": round(peak / 2**20, 2)}
+
+
+def run(num_employees):
+    seed(num_companies=20, departments_per_company=5, num_employees=num_employees)
+    client = api_client()
+
+    def materialized(start):
+        queryset = Employee.objects.select_related("company", "department").all()
+        JSONRenderer().render(EmployeeSerializer(queryset, many=True).data)
+        return (time.perf_counter() - start) * 1000
+
+    def streamed(accept):
+        def consume(start):
+            response = client.get("/api/employees/all/", HTTP_ACCEPT=accept)
+            chunks = iter(response.streaming_content)
+            next(chunks)
+            first_byte_ms = (time.perf_counter() - start) * 1000
+            for _ in chunks:
+                pass
+            return first_byte_ms
+        return consume
+
+    return {
+        "employees": num_employees,
+        "results": {
+            "materialized": profile(materialized),
+            "stream_json": profile(streamed("application/json")),
+            "stream_ndjson": profile(streamed("application/x-ndjson")),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    args = parser.parse_args()
+    with test_database():
+        print(json.dumps(run(args.employees), indent=2))
+
+
+if __name__ == "__main__":
+    main()
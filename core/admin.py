@@ -1,34 +1,147 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR
+from django.db.models import Sum
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
 
 from .models import Company, Department, Employee
+from .search import search_employees
+
+# Related rows shown in an inline; the rest are edited from their own changelist (linked from the parent form).
+INLINE_MAX_ROWS = 20
+# Changelist parameters that do not narrow the rows.
+NON_FILTER_PARAMS = {ALL_VAR, ERROR_FLAG, IS_FACETS_VAR, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR}
+
+
+class CappedInlineFormSet(BaseInlineFormSet):
+    """Only the newest ``INLINE_MAX_ROWS`` related rows, so a parent with thousands of them still opens."""
+
+    def get_queryset(self):
+        if not hasattr(self, "_queryset"):
+            self._queryset = super().get_queryset()[:INLINE_MAX_ROWS]
+        return self._queryset
+
+
+class DepartmentEmployeeFormSet(CappedInlineFormSet):
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        # An employee's company is always their department's, so the inline does not ask for it.
+        form.instance.company_id = self.instance.company_id
 
 
 class DepartmentInline(admin.TabularInline):
     model = Department
+    formset = CappedInlineFormSet
+    fields = ("name", "num_employees")
+    readonly_fields = ("num_employees",)
+    show_change_link = True
     extra = 1
 
+    def get_queryset(self, request):
+        # Each row's title is its __str__, which reads the company.
+        return super().get_queryset(request).select_related("company")
+
 
 class EmployeeInline(admin.TabularInline):
     model = Employee
+    formset = DepartmentEmployeeFormSet
+    fields = ("name", "email", "mobile", "designation", "status", "hired_on")
+    show_change_link = True
     extra = 1
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("company", "department")
+
+
+class DepartmentListFilter(admin.RelatedFieldListFilter):
+    """Department choices with their companies in one query, narrowed to the selected company."""
+
+    def field_choices(self, field, request, model_admin):
+        departments = Department.objects.select_related("company").order_by("company__name", "name")
+        company = request.GET.get("company__id__exact", "")
+        if company.isdigit():
+            departments = departments.filter(company_id=company)
+        return [(department.pk, str(department)) for department in departments]
+
+
+def changelist_link(model, label, count, **filters):
+    url = reverse(f"admin:core_{model._meta.model_name}_changelist")
+    query = "&".join(f"{name}={value}" for name, value in filters.items())
+    return format_html('<a href="{}?{}">View all {} {}</a>', url, query, count, label)
+
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
+    # num_departments/num_employees are counter columns (core.counters), not per-row COUNT queries.
     list_display = ("name", "num_departments", "num_employees")
     search_fields = ("name",)
+    readonly_fields = ("department_list",)
     inlines = [DepartmentInline]
 
+    @admin.display(description="Departments")
+    def department_list(self, obj):
+        if obj.pk is None:
+            return "-"
+        return changelist_link(Department, "departments", obj.num_departments, company__id__exact=obj.pk)
+
 
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ("name", "company", "num_employees")
+    list_select_related = ("company",)
     search_fields = ("name", "company__name")
+    autocomplete_fields = ("company",)
+    readonly_fields = ("employee_list",)
     inlines = [EmployeeInline]
 
+    def get_queryset(self, request):
+        # __str__ reads the company: change forms and autocomplete results need it joined.
+        return super().get_queryset(request).select_related("company")
+
+    @admin.display(description="Employees")
+    def employee_list(self, obj):
+        if obj.pk is None:
+            return "-"
+        return changelist_link(Employee, "employees", obj.num_employees, department__id__exact=obj.pk)
+
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
-    list_display = ("name", "email", "company", "department", "designation", "status", "hired_on")
+    list_display = ("name", "email", "company", "department_name", "designation", "status", "hired_on")
+    list_select_related = ("company", "department")
     search_fields = ("name", "email", "designation", "company__name", "department__name")
-    list_filter = ("company", "department", "status")
+    list_filter = ("company", ("department", DepartmentListFilter), "status")
+    autocomplete_fields = ("company", "department")
+    # "N results" without a second COUNT over the whole table.
+    show_full_result_count = False
+
+    @admin.display(description="department", ordering="department__name")
+    def department_name(self, obj):
+        return obj.department.name
+
+    def get_search_results(self, request, queryset, search_term):
+        # The FTS index behind the API's ?search= (core.search) instead of icontains over five columns.
+        return search_employees(queryset, search_term), False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        paginator = super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+        count = self.counter_count(request)
+        if count is not None:
+            paginator.count = count  # a cached_property: the paginator will not run COUNT(*)
+        return paginator
+
+    def counter_count(self, request):
+        """
+        The changelist's row count from the company/department counters when it
+        is unfiltered or filtered by company or department only, else ``None``.
+        """
+        params = {name: value for name, value in request.GET.items() if name not in NON_FILTER_PARAMS and value}
+        if not params:
+            return Company.objects.aggregate(total=Sum("num_employees"))["total"] or 0
+        if len(params) == 1:
+            (name, value), = params.items()
+            model = {"company__id__exact": Company, "department__id__exact": Department}.get(name)
+            if model is not None and value.isdigit():
+                return model.objects.filter(pk=value).values_list("num_employees", flat=True).first() or 0
+        return None
@@ -7,6 +7,12 @@ from .views import (
     DashboardStatsView,
 )
 from django.urls import path, include
+from .async_views import (
+    AsyncDashboardStatsView,
+    AsyncEmployeeStatusChoicesView,
+    AsyncListView,
+    AsyncRetrieveView,
+)
 from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
@@ -33,3 +39,23 @@ urlpatterns = router.urls + [
         name="dashboard-stats",
     ),
 ]
+
+# Async (ASGI) versions of the read endpoints; same responses as the routes above.
+async_urlpatterns = [
+    path("companies/", AsyncListView.as_view(viewset=CompanyViewSet), name="async-company-list"),
+    path("companies/<int:pk>/", AsyncRetrieveView.as_view(viewset=CompanyViewSet), name="async-company-detail"),
+    path("departments/", AsyncListView.as_view(viewset=DepartmentViewSet), name="async-department-list"),
+    path(
+        "departments/<int:pk>/", AsyncRetrieveView.as_view(viewset=DepartmentViewSet), name="async-department-detail"
+    ),
+    path("employees/", AsyncListView.as_view(viewset=EmployeeViewSet), name="async-employee-list"),
+    path("employees/<int:pk>/", AsyncRetrieveView.as_view(viewset=EmployeeViewSet), name="async-employee-detail"),
+    path(
+        "employee-status-choices/",
+        AsyncEmployeeStatusChoicesView.as_view(),
+        name="async-employee-status-choices",
+    ),
+    path("dashboard-stats/", AsyncDashboardStatsView.as_view(), name="async-dashboard-stats"),
+]
+
+urlpatterns += [path("async/", include(async_urlpatterns))]
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+
+        # The FTS5 search table is not a model, so it is created after migrate (and test database setup).
+        post_migrate.connect(signals.create_search_index, sender=self)
+        post_migrate.connect(signals.create_table_versions, sender=self)
+        post_migrate.connect(signals.recount_counters, sender=self)
@@ -0,0 +1,137 @@
+"""
+Async read endpoints for ASGI deployments, mounted under ``/api/async/``.
+
+DRF views are synchronous, so under ASGI each request holds a threadpool slot
+for its whole run. These views serve the same reads with the same JSON, but
+wait on the database through the async ORM (``acount``, ``aget``,
+``async for``). The DRF viewsets still supply the queryset, filters,
+serializer and permissions, so the two stay in step. Authentication and
+permissions work from the token alone and need no database.
+
+Covered: company/department/employee list and retrieve, employee status
+choices and dashboard stats. Writes, ``all`` and ``export`` stay on the DRF views.
+"""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from . import dashboard, jsoncodec
+from .replicas import is_pinned, reading_from_replica
+from .views import STATUS_CHOICES, DashboardStatsView, EmployeeStatusChoicesView
+
+
+class AsyncReadView(View):
+    """Subclasses define ``async read(request, **kwargs)``, returning the data to render or a response."""
+
+    permission_classes = [IsAuthenticated]
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+        self.headers = {}
+        try:
+            self.check_permissions(request, self.get_permissions(request, kwargs))
+            token = reading_from_replica.set(not is_pinned(request.user.pk))
+            try:
+                data = await self.read(request, **kwargs)
+            finally:
+                reading_from_replica.reset(token)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+        if isinstance(data, HttpResponse):
+            return data
+        return self.render(data, headers=self.headers)
+
+    def get_permissions(self, request, kwargs):
+        return [permission() for permission in self.permission_classes]
+
+    def check_permissions(self, request, permissions):
+        for permission in permissions:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, request, exc):
+        """Same status codes, headers and bodies as ``APIView.handle_exception``."""
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            auth_header = request.authenticators[0].authenticate_header(request) if request.authenticators else None
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+        response = exception_handler(exc, {"view": self, "request": request})
+        if response is None:
+            raise exc
+        headers = {name: value for name, value in response.headers.items() if name.lower() != "content-type"}
+        return self.render(response.data, status=response.status_code, headers=headers)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(jsoncodec.dumps(data), status=status, content_type="application/json", headers=headers)
+
+
+class AsyncViewSetReadView(AsyncReadView):
+    """Runs one read ``action`` of a DRF ``viewset`` on the async ORM."""
+
+    viewset = None
+    action = None
+
+    def get_permissions(self, request, kwargs):
+        self.drf_view = self.viewset(request=request, action=self.action, args=(), kwargs=kwargs, format_kwarg=None)
+        return self.drf_view.get_permissions()
+
+    async def filtered_queryset(self):
+        # Filter validation may look up the ?company=/?department= rows, which is sync-only ORM code.
+        return await sync_to_async(self.drf_view.filter_queryset)(self.drf_view.get_queryset())
+
+
+class AsyncListView(AsyncViewSetReadView):
+    action = "list"
+
+    async def read(self, request, **kwargs):
+        view = self.drf_view
+        page = await view.paginator.apaginate_queryset(await self.filtered_queryset(), request, view=view)
+        return view.paginator.get_paginated_response(view.get_serializer(page, many=True).data).data
+
+
+class AsyncRetrieveView(AsyncViewSetReadView):
+    action = "retrieve"
+
+    async def read(self, request, pk):
+        view = self.drf_view
+        queryset = await self.filtered_queryset()
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise exceptions.NotFound(f"No {queryset.model._meta.object_name} matches the given query.")
+        view.check_object_permissions(request, instance)
+        return view.get_serializer(instance).data
+
+
+class AsyncEmployeeStatusChoicesView(AsyncReadView):
+    permission_classes = EmployeeStatusChoicesView.permission_classes
+
+    async def read(self, request):
+        return STATUS_CHOICES.response(request)
+
+
+class AsyncDashboardStatsView(AsyncReadView):
+    permission_classes = DashboardStatsView.permission_classes
+
+    async def read(self, request):
+        data, built_at, hit = await dashboard.aget_snapshot()
+        self.headers.update({
+            "X-Cache": "HIT" if hit else "MISS",
+            "X-Cache-Age": str(int(time.time() - built_at)),
+            "X-Cache-Hit-Rate": f"{await dashboard.ahit_rate():.3f}",
+        })
+        return data
@@ -0,0 +1,19 @@
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from accounts.revocation import is_revoked
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the access token alone: ``request.user`` is a TokenUser
+    whose ``role``/``email`` come from the claims set in
+    CustomTokenObtainPairSerializer, so role permissions need no user query.
+    Deactivated, deleted or re-roled users are refused via accounts.revocation.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        if is_revoked(user.id, validated_token.get("iat", 0)):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return user
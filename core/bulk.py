@@ -0,0 +1,186 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import conditional, dashboard, search
+from .counters import apply_deltas
+from .models import E164_MOBILE_ERROR, E164_MOBILE_RE, Company, Department, Employee
+
+BULK_BATCH_SIZE = 500
+BULK_MAX_ROWS = 10000
+WRITE_FIELDS = ["company", "department", "status", "name", "email", "mobile", "address", "designation", "hired_on"]
+
+
+class EmployeeBulkRowSerializer(serializers.ModelSerializer):
+    """Field-level checks only; everything that needs the database is done set-based by EmployeeBulkLoader."""
+
+    company = serializers.IntegerField()
+    department = serializers.IntegerField()
+
+    class Meta:
+        model = Employee
+        fields = WRITE_FIELDS
+        extra_kwargs = {"email": {"validators": []}, "mobile": {"validators": []}}
+
+    def get_validators(self):
+        return []
+
+
+class EmployeeBulkLoader:
+    """
+    Validates and writes a batch of employee rows in a fixed number of queries:
+    companies, departments, existing emails and mobiles, plus one name lookup per
+    department. Rows are matched to existing employees by email. Valid rows are
+    written even when others fail; failures are reported per row index.
+    """
+
+    MODES = ("create", "update", "upsert")
+
+    def __init__(self, rows, mode="upsert"):
+        self.rows = rows
+        self.mode = mode
+        self.errors = {}
+
+    def add_error(self, index, field, message):
+        self.errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    def run(self):
+        rows = self.validate()
+        created, updated = self.write(rows)
+        return {
+            "created": created,
+            "updated": updated,
+            "errors": [{"index": index, "errors": errors} for index, errors in sorted(self.errors.items())],
+        }
+
+    def validate(self):
+        """Return ``{index: validated_data}`` for the rows that passed every check."""
+        rows = {}
+        for index, row in enumerate(self.rows):
+            if not isinstance(row, dict):
+                self.add_error(index, "non_field_errors", "Expected an object.")
+                continue
+            serializer = EmployeeBulkRowSerializer(data=row)
+            if not serializer.is_valid():
+                self.errors[index] = serializer.errors
+                continue
+            data = serializer.validated_data
+            if not E164_MOBILE_RE.match(data["mobile"]):
+                self.add_error(index, "mobile", E164_MOBILE_ERROR)
+                continue
+            rows[index] = data
+
+        self.check_foreign_keys(rows)
+        self.check_payload_duplicates(rows)
+        self.existing = {
+            employee.email: employee
+            for employee in Employee.objects.filter(email__in=[data["email"] for data in rows.values()])
+        }
+        self.check_mode(rows)
+        self.check_mobiles(rows)
+        self.check_names(rows)
+        return rows
+
+    def reject(self, rows, index, field, message):
+        self.add_error(index, field, message)
+        rows.pop(index)
+
+    def own_id(self, data):
+        existing = self.existing.get(data["email"])
+        return existing.pk if existing else None
+
+    def check_foreign_keys(self, rows):
+        company_ids = set(
+            Company.objects.filter(pk__in={data["company"] for data in rows.values()}).values_list("pk", flat=True)
+        )
+        department_companies = dict(
+            Department.objects.filter(pk__in={data["department"] for data in rows.values()}).values_list("pk", "company_id")
+        )
+        for index, data in list(rows.items()):
+            if data["company"] not in company_ids:
+                self.reject(rows, index, "company", f'Invalid pk "{data["company"]}" - object does not exist.')
+            elif data["department"] not in department_companies:
+                self.reject(rows, index, "department", f'Invalid pk "{data["department"]}" - object does not exist.')
+            elif department_companies[data["department"]] != data["company"]:
+                self.reject(rows, index, "department", "Department must belong to the selected company.")
+
+    def check_payload_duplicates(self, rows):
+        seen = {"email": set(), "mobile": set(), "name": set()}
+        for index, data in list(rows.items()):
+            keys = {"email": data["email"], "mobile": data["mobile"], "name": (data["department"], data["name"].lower())}
+            duplicate = next((field for field, key in keys.items() if key in seen[field]), None)
+            if duplicate:
+                self.reject(rows, index, duplicate, f"Duplicate {duplicate} in this payload.")
+                continue
+            for field, key in keys.items():
+                seen[field].add(key)
+
+    def check_mode(self, rows):
+        for index, data in list(rows.items()):
+            exists = data["email"] in self.existing
+            if self.mode == "create" and exists:
+                self.reject(rows, index, "email", "employee with this email already exists.")
+            elif self.mode == "update" and not exists:
+                self.reject(rows, index, "email", "No employee with this email exists.")
+
+    def check_mobiles(self, rows):
+        taken = dict(
+            Employee.objects.filter(mobile__in=[data["mobile"] for data in rows.values()]).values_list("mobile", "pk")
+        )
+        for index, data in list(rows.items()):
+            if taken.get(data["mobile"], self.own_id(data)) != self.own_id(data):
+                self.reject(rows, index, "mobile", "employee with this mobile already exists.")
+
+    def check_names(self, rows):
+        names_by_department = defaultdict(set)
+        for data in rows.values():
+            names_by_department[data["department"]].add(data["name"].lower())
+        taken = {}
+        for department_id, names in names_by_department.items():
+            matches = (
+                Employee.objects.filter(department_id=department_id)
+                .annotate(lower_name=Lower("name"))
+                .filter(lower_name__in=names)
+                .values_list("lower_name", "pk")
+            )
+            taken.update({(department_id, name): pk for name, pk in matches})
+        for index, data in list(rows.items()):
+            key = (data["department"], data["name"].lower())
+            if taken.get(key, self.own_id(data)) != self.own_id(data):
+                self.reject(rows, index, "name", "An employee with this name already exists in this department.")
+
+    def write(self, rows):
+        to_create, to_update = [], []
+        company_deltas, department_deltas = Counter(), Counter()
+        now = timezone.now()
+        for data in rows.values():
+            employee = self.existing.get(data["email"])
+            if employee is None:
+                employee = Employee()
+                to_create.append(employee)
+            else:
+                company_deltas[employee.company_id] -= 1
+                department_deltas[employee.department_id] -= 1
+                to_update.append(employee)
+            for field, value in data.items():
+                setattr(employee, f"{field}_id" if field in ("company", "department") else field, value)
+            employee.set_hired_on()
+            employee.updated_at = now
+            company_deltas[employee.company_id] += 1
+            department_deltas[employee.department_id] += 1
+
+        with transaction.atomic():
+            # bulk_create/bulk_update skip save() and signals, so counters, the search index, the
+            # dashboard and the table version are updated here.
+            Employee.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+            Employee.objects.bulk_update(to_update, WRITE_FIELDS + ["updated_at"], batch_size=BULK_BATCH_SIZE)
+            apply_deltas(Company, "num_employees", company_deltas)
+            apply_deltas(Department, "num_employees", department_deltas)
+            search.index_employees([employee.pk for employee in to_create + to_update])
+            if to_create or to_update:
+                dashboard.invalidate()
+                conditional.bump(Employee)
+        return len(to_create), len(to_update)
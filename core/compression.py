@@ -0,0 +1,144 @@
+"""
+Response compression with a size threshold, replacing Django's GZipMiddleware.
+
+The encoding is the first entry of ``COMPRESSION_ENCODINGS`` (default
+``br,gzip``) that the client's ``Accept-Encoding`` allows. Brotli is only
+offered when the ``brotli`` package is installed. Bodies smaller than
+``COMPRESSION_MIN_BYTES`` are sent as they are, because the saving is less
+than a packet. Only text types are compressed (JSON, NDJSON, CSV, YAML,
+HTML, ...).
+
+Streamed responses (``all``, ``export``) are compressed as they go: the
+compressor emits output whenever its buffer fills, rather than once per row.
+As with GZipMiddleware, ``Vary: Accept-Encoding`` is added and strong ETags
+become weak on compressed responses, so ``If-None-Match`` still matches.
+"""
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is used instead
+    brotli = None
+
+COMPRESSIBLE_TYPE = re.compile(r"^(text/|application/([\w.-]+\+)?(json|x-ndjson|javascript|xml|yaml))")
+# Faster settings than the libraries' defaults (brotli 11, zlib 9 for max) suit per-request compression.
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+class GzipCompressor:
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def process(self, data):
+        return self.compressor.compress(data)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def process(self, data):
+        return self.compressor.process(data)
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+
+
+def accepted_encoding(request):
+    """The preferred encoding from ``COMPRESSION_ENCODINGS`` that ``Accept-Encoding`` allows, or ``None``."""
+    accepted = {}
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([\d.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                continue
+        accepted[coding.strip().lower()] = quality
+    for encoding in settings.COMPRESSION_ENCODINGS:
+        if encoding in COMPRESSORS and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(content, encoding):
+    compressor = COMPRESSORS[encoding]()
+    return compressor.process(content) + compressor.finish()
+
+
+def compress_stream(chunks, encoding):
+    compressor = COMPRESSORS[encoding]()
+    for chunk in chunks:
+        data = compressor.process(chunk if isinstance(chunk, bytes) else chunk.encode())
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    compressor = COMPRESSORS[encoding]()
+    async for chunk in chunks:
+        data = compressor.process(chunk if isinstance(chunk, bytes) else chunk.encode())
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def mark_encoded(response, encoding):
+    """Headers for a body now encoded with ``encoding``."""
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = encoding
+
+
+def compressible(response):
+    if response.has_header("Content-Encoding"):
+        return False
+    if not COMPRESSIBLE_TYPE.match(response.get("Content-Type", "")):
+        return False
+    return response.streaming or len(response.content) >= settings.COMPRESSION_MIN_BYTES
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    # MiddlewareMixin, like GZipMiddleware, so the async views run under ASGI without a thread hop.
+
+    def process_response(self, request, response):
+        if not compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = accepted_encoding(request)
+        if encoding is None:
+            return response
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # The compressed size is not known until the stream ends.
+            del response.headers["Content-Length"]
+        else:
+            content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+        mark_encoded(response, encoding)
+        return response
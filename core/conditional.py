@@ -0,0 +1,95 @@
+"""
+HTTP conditional requests for the company, department and employee endpoints.
+
+Each table has a change counter (``TableVersion``). core.signals, the counter
+updates and the bulk writers bump it in the same transaction as the write. A
+list or detail response carries a strong ETag built from the counters of the
+tables it shows, the URL and the rendered format. Its Last-Modified is the
+newest of those tables' changes. A matching ``If-None-Match`` (or
+``If-Modified-Since``) gets a 304 after one query on the counter table, before
+the list query and the serializers run.
+"""
+
+import datetime
+import hashlib
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import Company, Department, Employee, TableVersion
+
+
+def bump(*models, using="default"):
+    """Record a change to each model's table; call it inside the write's transaction."""
+    now = timezone.now()
+    for model in models:
+        versions = TableVersion.objects.using(using).filter(table=model._meta.db_table)
+        if not versions.update(version=F("version") + 1, modified_at=now):
+            _, created = TableVersion.objects.using(using).get_or_create(
+                table=model._meta.db_table, defaults={"version": 1, "modified_at": now}
+            )
+            if not created:
+                # Another writer created the row first; still count this change.
+                versions.update(version=F("version") + 1, modified_at=now)
+
+
+def create_versions(using="default", **kwargs):
+    """post_migrate hook: start every versioned table's counter so ``bump()`` is a single UPDATE."""
+    now = timezone.now()
+    TableVersion.objects.using(using).bulk_create(
+        [TableVersion(table=model._meta.db_table, modified_at=now) for model in (Company, Department, Employee)],
+        ignore_conflicts=True,
+    )
+
+
+def versions(models):
+    """``{table: (version, modified_at)}`` for the given models; tables never written are left out."""
+    rows = TableVersion.objects.filter(table__in=[model._meta.db_table for model in models])
+    return {table: (version, modified_at) for table, version, modified_at in rows.values_list("table", "version", "modified_at")}
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag and Last-Modified on ``list`` and ``retrieve``, and 304 Not Modified
+    when the client's copy is current. ``version_models`` maps each action to the
+    models its responses show. Set ``changes_daily`` when the representation also
+    depends on today's date.
+    """
+
+    version_models = {}
+    changes_daily = False
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # Browsers may keep the response but must revalidate it before every use.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validators(self, request):
+        """Return ``(etag, last_modified timestamp)`` for this request."""
+        tables = sorted(model._meta.db_table for model in self.version_models[self.action])
+        current = versions(self.version_models[self.action])
+        parts = [f"{table}:{current.get(table, (0, None))[0]}" for table in tables]
+        parts += [request.build_absolute_uri(), request.accepted_renderer.format]
+        modified = [modified_at for _, modified_at in current.values()] or [datetime.datetime.fromtimestamp(0, datetime.UTC)]
+        if self.changes_daily:
+            today = timezone.localdate()
+            parts.append(today.isoformat())
+            modified.append(timezone.make_aware(datetime.datetime.combine(today, datetime.time())))
+        digest = hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+        return f'"{digest}"', int(max(modified).timestamp())
@@ -0,0 +1,70 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from . import conditional
+from .models import Company, Department, Employee
+
+REPAIR_BATCH_SIZE = 500
+
+# (model, counter field, child model, child FK pointing at model)
+COUNTERS = [
+    (Company, "num_departments", Department, "company"),
+    (Company, "num_employees", Employee, "company"),
+    (Department, "num_employees", Employee, "department"),
+]
+
+
+def adjust(model, pk, delta, field):
+    if pk is None or not delta:
+        return
+    queryset = model.objects.filter(pk=pk)
+    if delta < 0:
+        # Never drive a drifted counter below zero; `manage.py recount` repairs it.
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+    if queryset.update(**{field: F(field) + delta}):
+        # The counters are part of the API representation.
+        conditional.bump(model)
+
+
+def apply_deltas(model, field, deltas):
+    """Apply a ``{pk: delta}`` mapping, for bulk writes that bypass the counter signals."""
+    for pk, delta in deltas.items():
+        adjust(model, pk, delta, field)
+
+
+def actual_count(child_model, fk):
+    counts = (
+        child_model.objects.filter(**{fk: OuterRef("pk")})
+        .order_by()
+        .values(fk)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def recount(repair=True, using="default"):
+    """
+    Compare every denormalized counter with a fresh COUNT and, when ``repair`` is
+    set, rewrite the drifted rows. Returns ``{"Model.field": [(pk, stored, actual), ...]}``.
+    """
+    drift = {}
+    with transaction.atomic(using=using):
+        for model, field, child_model, fk in COUNTERS:
+            rows = list(
+                model.objects.using(using).annotate(_actual=actual_count(child_model, fk))
+                .filter(~Q(**{field: F("_actual")}))
+                .order_by("pk")
+                .values_list("pk", field, "_actual")
+            )
+            drift[f"{model.__name__}.{field}"] = rows
+            if repair:
+                pks = [pk for pk, _, _ in rows]
+                if pks:
+                    conditional.bump(model, using=using)
+                for start in range(0, len(pks), REPAIR_BATCH_SIZE):
+                    model.objects.using(using).filter(pk__in=pks[start:start + REPAIR_BATCH_SIZE]).update(
+                        **{field: actual_count(child_model, fk)}
+                    )
+    return drift
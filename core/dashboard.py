@@ -0,0 +1,133 @@
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F
+
+from .models import Company, Department, Employee
+
+SNAPSHOT_KEY = "dashboard-stats:snapshot"
+HITS_KEY = "dashboard-stats:hits"
+MISSES_KEY = "dashboard-stats:misses"
+# Upper bound on staleness if an invalidation is ever missed (e.g. raw SQL writes).
+SNAPSHOT_TIMEOUT = 60 * 60
+# On a per-process cache, writes handled by other workers never invalidate this worker's snapshot.
+LOCAL_SNAPSHOT_TIMEOUT = 5
+
+
+def get_cache():
+    return caches["default"]
+
+
+def snapshot_timeout():
+    if isinstance(get_cache(), (LocMemCache, DummyCache)):
+        return LOCAL_SNAPSHOT_TIMEOUT
+    return SNAPSHOT_TIMEOUT
+
+
+def build_stats():
+    return {
+        'stats': {
+            'companies': Company.objects.count(),
+            'departments': Department.objects.count(),
+            'employees': Employee.objects.count(),
+        },
+        'chart_data': {
+            'employees_per_company': list(
+                Company.objects.filter(num_employees__gt=0).values('name', employee_count=F('num_employees'))
+            ),
+            'departments_per_company': list(
+                Company.objects.filter(num_departments__gt=0).values('name', department_count=F('num_departments'))
+            ),
+        },
+    }
+
+
+async def abuild_stats():
+    """``build_stats()`` on the async ORM, for the ASGI views in core.async_views."""
+    return {
+        'stats': {
+            'companies': await Company.objects.acount(),
+            'departments': await Department.objects.acount(),
+            'employees': await Employee.objects.acount(),
+        },
+        'chart_data': {
+            'employees_per_company': [
+                row async for row in
+                Company.objects.filter(num_employees__gt=0).values('name', employee_count=F('num_employees'))
+            ],
+            'departments_per_company': [
+                row async for row in
+                Company.objects.filter(num_departments__gt=0).values('name', department_count=F('num_departments'))
+            ],
+        },
+    }
+
+
+def record(key):
+    cache = get_cache()
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def rate(counts):
+    hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def hit_rate():
+    return rate(get_cache().get_many([HITS_KEY, MISSES_KEY]))
+
+
+def get_snapshot():
+    """
+    Return ``(stats, built_at, hit)``. The snapshot is rebuilt on a miss and
+    dropped by ``invalidate()`` whenever a write changes what it reports.
+    """
+    cache = get_cache()
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None:
+        record(HITS_KEY)
+        return snapshot["stats"], snapshot["built_at"], True
+    record(MISSES_KEY)
+    stats, built_at = build_stats(), time.time()
+    cache.set(SNAPSHOT_KEY, {"stats": stats, "built_at": built_at}, timeout=snapshot_timeout())
+    return stats, built_at, False
+
+
+async def arecord(key):
+    cache = get_cache()
+    if not await cache.aadd(key, 1, timeout=None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, timeout=None)
+
+
+async def ahit_rate():
+    return rate(await get_cache().aget_many([HITS_KEY, MISSES_KEY]))
+
+
+async def aget_snapshot():
+    """Async ``get_snapshot()``: same cache entry, same hit/miss counters."""
+    cache = get_cache()
+    snapshot = await cache.aget(SNAPSHOT_KEY)
+    if snapshot is not None:
+        await arecord(HITS_KEY)
+        return snapshot["stats"], snapshot["built_at"], True
+    await arecord(MISSES_KEY)
+    stats, built_at = await abuild_stats(), time.time()
+    await cache.aset(SNAPSHOT_KEY, {"stats": stats, "built_at": built_at}, timeout=snapshot_timeout())
+    return stats, built_at, False
+
+
+def invalidate():
+    cache = get_cache()
+    cache.delete(SNAPSHOT_KEY)
+    # Drop it again once the write is visible, so a snapshot rebuilt mid-transaction is not kept.
+    transaction.on_commit(lambda: cache.delete(SNAPSHOT_KEY))
@@ -0,0 +1,134 @@
+"""
+Read-only fast path for list responses.
+
+``ModelSerializer`` builds a model instance per row and resolves every field
+through ``get_attribute()``/``to_representation()``. For flat, read-only
+output the same dicts can be produced straight from ``values_list()`` rows.
+Each serializer field is compiled once into a column index plus a converter:
+plain ints, strings and primary keys are copied as they are; every other field
+type goes through that field's own ``to_representation()``. A model property
+is called against the row's columns, which the serializer declares in
+``source_columns``. The output matches the serializer byte for byte (see
+FastPathParityTests).
+
+A serializer qualifies only if every field can be read this way. Nested
+serializers, method fields and overridden ``to_representation()`` fall back
+to the regular path.
+"""
+
+import types
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+# Field types whose to_representation() of a non-None value is the value itself (ints from the
+# database) or str() of it; anything else calls the field's own to_representation().
+IDENTITY_FIELDS = (serializers.IntegerField, serializers.ReadOnlyField)
+STRING_FIELDS = (serializers.CharField, serializers.EmailField)
+
+
+class FastSerializer:
+    def __init__(self, paths, fields):
+        self.paths = paths
+        # (output name, column index or None, converter, property getter, property columns)
+        self.fields = fields
+
+    def values(self, queryset):
+        """The queryset as ``values_list()`` rows; named and always with the pk, so cursor pagination can read ``row.id``."""
+        return queryset.values_list(*self.paths, named=True)
+
+    def rows(self, rows):
+        """Serialize ``values()`` rows into the list of dicts the serializer would produce."""
+        return list(self.iter_rows(rows))
+
+    def iter_rows(self, rows):
+        proxy = types.SimpleNamespace()  # stands in for the instance when calling model properties
+        fields = self.fields
+        for row in rows:
+            item = {}
+            for name, index, convert, getter, columns in fields:
+                if getter is None:
+                    value = row[index]
+                else:
+                    for column, column_index in columns:
+                        setattr(proxy, column, row[column_index])
+                    value = getter(proxy)
+                item[name] = None if value is None else convert(value) if convert else value
+            yield item
+
+
+def converter(field):
+    if isinstance(field, PrimaryKeyRelatedField):
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if type(field) in IDENTITY_FIELDS:
+        return None
+    if type(field) in STRING_FIELDS:
+        return str
+    return field.to_representation
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class, names=None):
+    """
+    A ``FastSerializer`` for ``serializer_class`` restricted to ``names`` (all
+    fields when ``None``), or ``None`` if some field cannot be read from ``values()``.
+    """
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        return None
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    source_columns = getattr(serializer, "source_columns", {})
+    paths, compiled = [], []
+
+    def column(path):
+        if path not in paths:
+            paths.append(path)
+        return paths.index(path)
+
+    for name, field in serializer.fields.items():
+        if names is not None and name not in names:
+            continue
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+            return None
+        source = field.source.split(".")
+        try:
+            model_field = model._meta.get_field(source[0])
+        except FieldDoesNotExist:
+            model_field = None
+        if model_field is not None and model_field.concrete:
+            compiled.append((name, column("__".join(source)), converter(field), None, ()))
+        elif len(source) == 1 and isinstance(getattr(model, source[0], None), property) and name in source_columns:
+            columns = tuple((col, column(col)) for col in source_columns[name])
+            compiled.append((name, None, converter(field), getattr(model, source[0]).fget, columns))
+        else:
+            return None
+    # Always selected, rendered or not: cursor pagination reads row.id for the next link.
+    column(model._meta.pk.attname)
+    return FastSerializer(tuple(paths), tuple(compiled))
+
+
+class FastListMixin:
+    """Serves ``list`` and the streamed ``all`` rows through the fast path when the serializer qualifies."""
+
+    def fast_serializer(self):
+        fields = self.get_serializer_context().get("fields")
+        return compile_serializer(self.get_serializer_class(), tuple(fields) if fields is not None else None)
+
+    def list(self, request, *args, **kwargs):
+        fast = self.fast_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        rows = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.rows(page))
+        return Response(fast.rows(rows))
+
+    def serialized_rows(self, queryset):
+        fast = self.fast_serializer()
+        if fast is None:
+            return super().serialized_rows(queryset)
+        return fast.iter_rows(fast.values(queryset).iterator(chunk_size=self.stream_chunk_size))
@@ -0,0 +1,95 @@
+"""
+JSON encoding and decoding for the API, with a pluggable backend.
+
+``JSON_BACKEND=orjson`` (the default) encodes with orjson, several times
+faster than the standard library on large lists. If orjson is not installed,
+or ``JSON_BACKEND=stdlib`` is set, the standard library is used. The output
+is the same either way: DRF's compact form, without ASCII escaping and with
+U+2028/U+2029 escaped. Dates, decimals, lazy strings and other types orjson
+leaves alone go through DRF's ``JSONEncoder``.
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib backend is used instead
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def escape_line_separators(content):
+    # Like DRF's JSONRenderer: keep the output a strict JavaScript subset.
+    if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return content
+
+
+class StdlibBackend:
+    name = "stdlib"
+
+    def __init__(self):
+        self.encoder = JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+    def dumps(self, data):
+        return escape_line_separators(self.encoder.encode(data).encode())
+
+    def loads(self, content):
+        # NaN and Infinity are rejected, as by orjson and DRF's strict JSONParser.
+        try:
+            return json.loads(content, parse_constant=strict_constant)
+        except RecursionError:
+            # orjson stops at 1024 levels; the stdlib recurses until the interpreter limit.
+            raise ValueError("JSON nested too deeply")
+
+
+class OrjsonBackend:
+    name = "orjson"
+    # Datetimes go through DRF's encoder (millisecond precision, "Z" for UTC) instead of orjson's RFC 3339.
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def __init__(self):
+        self.stdlib = StdlibBackend()
+        self.default = self.stdlib.encoder.default
+
+    def dumps(self, data):
+        try:
+            content = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits: the standard library encodes them, or raises its usual error.
+            return self.stdlib.dumps(data)
+        return escape_line_separators(content)
+
+    def loads(self, content):
+        return orjson.loads(content)
+
+
+BACKENDS = {"orjson": OrjsonBackend, "stdlib": StdlibBackend}
+
+
+def get_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON_BACKEND {name!r}; expected one of: {', '.join(BACKENDS)}.")
+    if name == "orjson" and orjson is None:
+        logger.info("orjson is not installed; encoding JSON with the standard library")
+        name = "stdlib"
+    return BACKENDS[name]()
+
+
+backend = get_backend(settings.JSON_BACKEND)
+
+
+def dumps(data):
+    """``data`` as compact UTF-8 JSON bytes."""
+    return backend.dumps(data)
+
+
+def loads(content):
+    """Parse JSON ``content`` (bytes or str); raises ``ValueError`` on invalid input."""
+    return backend.loads(content)
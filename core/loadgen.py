@@ -0,0 +1,101 @@
+"""
+Deterministic synthetic dataset for benchmarks.
+
+Company sizes follow a Zipf-like curve, so a few companies are huge and most
+are small, which is the shape that exposes N+1 and COUNT/OFFSET costs.
+Everything is inserted with bulk_create and the counter columns, search
+index and table versions are refreshed once at the end.
+"""
+
+import datetime
+import random
+
+from django.db import transaction
+
+from . import conditional, search
+from .counters import recount
+from .models import Company, Department, Employee
+
+COMPANY_PREFIX = "Load Co"
+ANCHOR_DATE = datetime.date(2025, 1, 1)
+FIRST_NAMES = ["Ada", "Ben", "Chen", "Dana", "Eli", "Fatima", "Goran", "Hana", "Ivan", "Jia", "Kofi", "Lena", "Mo", "Nina", "Omar", "Priya"]
+LAST_NAMES = ["Smith", "Garcia", "Kim", "Nguyen", "Okafor", "Rossi", "Silva", "Tanaka", "Weber", "Yilmaz"]
+DEPARTMENT_NAMES = ["Engineering", "Sales", "Support", "Finance", "HR", "Marketing", "Legal", "Operations", "Research", "QA", "Security", "Design"]
+DESIGNATIONS = ["Engineer", "Manager", "Analyst", "Clerk", "Scientist", "Designer", "Consultant"]
+STATUS_WEIGHTS = {
+    Employee.Status.HIRED: 60,
+    Employee.Status.APPLICATION_RECEIVED: 15,
+    Employee.Status.INTERVIEW_SCHEDULED: 15,
+    Employee.Status.NOT_ACCEPTED: 10,
+}
+
+
+def company_sizes(num_companies, num_employees, rng, skew=1.1):
+    """Split ``num_employees`` across companies with Zipf-like weights."""
+    weights = [1 / (rank + 1) ** skew for rank in range(num_companies)]
+    sizes = [0] * num_companies
+    for index in rng.choices(range(num_companies), weights=weights, k=num_employees):
+        sizes[index] += 1
+    return sizes
+
+
+def generate(num_companies, num_employees, seed=0, batch_size=5000, log=print):
+    """Insert the dataset and return ``(companies, departments, employees)`` counts."""
+    if Company.objects.filter(name__startswith=COMPANY_PREFIX).exists():
+        raise ValueError(f'Load data already exists (companies named "{COMPANY_PREFIX} ..."); use a fresh database.')
+    rng = random.Random(seed)
+    sizes = company_sizes(num_companies, num_employees, rng)
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+
+    with transaction.atomic():
+        companies = Company.objects.bulk_create(
+            [Company(name=f"{COMPANY_PREFIX} {index:06d}") for index in range(num_companies)], batch_size=batch_size
+        )
+        departments = Department.objects.bulk_create(
+            [
+                Department(company=company, name=name)
+                for company, size in zip(companies, sizes)
+                # Roughly one department per 250 employees, at least one.
+                for name in DEPARTMENT_NAMES[: max(1, min(len(DEPARTMENT_NAMES), size // 250 + 1))]
+            ],
+            batch_size=batch_size,
+        )
+    log(f"Created {len(companies)} companies and {len(departments)} departments.")
+
+    departments_by_company = {}
+    for department in departments:
+        departments_by_company.setdefault(department.company_id, []).append(department.pk)
+
+    batch, created = [], 0
+    for company, size in zip(companies, sizes):
+        company_departments = departments_by_company[company.pk]
+        for _ in range(size):
+            status = rng.choices(statuses, weights=status_weights)[0]
+            hired = status == Employee.Status.HIRED
+            batch.append(
+                Employee(
+                    company_id=company.pk,
+                    department_id=rng.choice(company_departments),
+                    status=status,
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {created}",
+                    email=f"load{created}@example.com",
+                    mobile=f"+1{2000000000 + created}",
+                    address=f"{rng.randint(1, 9999)} Main St",
+                    designation=rng.choice(DESIGNATIONS),
+                    hired_on=ANCHOR_DATE - datetime.timedelta(days=rng.randint(0, 3650)) if hired else None,
+                )
+            )
+            created += 1
+            if len(batch) >= batch_size:
+                with transaction.atomic():
+                    Employee.objects.bulk_create(batch)
+                batch = []
+                if created % (batch_size * 20) == 0:
+                    log(f"{created} employees...")
+    with transaction.atomic():
+        Employee.objects.bulk_create(batch)
+    recount()  # bulk_create bypasses the counter, search and table version signals
+    conditional.bump(Company, Department, Employee)
+    search.rebuild()
+    log(f"Created {created} employees.")
+    return len(companies), len(departments), created
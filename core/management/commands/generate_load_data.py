@@ -0,0 +1,49 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import dashboard
+from core.loadgen import generate
+
+
+class Command(BaseCommand):
+    help = (
+        "Populate the demo data (demo_data.populate) and then bulk insert a deterministic, skewed synthetic "
+        "dataset for benchmarking: a few huge companies and a long tail of small ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--companies", type=int, default=1000)
+        parser.add_argument("--employees", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=0, help="Same seed, same dataset.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--skip-demo", action="store_true", help="Do not run demo_data.populate() first.")
+
+    def handle(self, *args, **options):
+        if options["companies"] < 1:
+            raise CommandError("--companies must be at least 1.")
+        start = time.perf_counter()
+        if not options["skip_demo"]:
+            from demo_data import populate
+
+            random.seed(options["seed"])  # populate() draws from the global generator
+            populate()
+        try:
+            generate(
+                options["companies"],
+                options["employees"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        dashboard.invalidate()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {options['employees']} employees across {options['companies']} companies in {elapsed:.1f}s "
+                f"({options['employees'] / elapsed:.0f} rows/s)."
+            )
+        )
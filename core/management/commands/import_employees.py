@@ -0,0 +1,172 @@
+import csv
+import datetime
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from core import conditional, dashboard, search
+from core.counters import apply_deltas
+from core.models import E164_MOBILE_ERROR, E164_MOBILE_RE, Company, Department, Employee
+
+REQUIRED_COLUMNS = ["name", "email", "mobile", "company", "department", "designation"]
+OPTIONAL_COLUMNS = ["status", "address", "hired_on"]
+STATUSES = set(Employee.Status.values)
+
+
+class RowError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream employees from a CSV file into the database in bulk batches. Columns: "
+        + ", ".join(REQUIRED_COLUMNS + OPTIONAL_COLUMNS)
+        + " (company and department are names). Progress is checkpointed after every committed "
+        "batch; rerun with --resume to continue after a failure."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk insert / transaction.")
+        parser.add_argument("--resume", action="store_true", help="Skip rows committed by a previous run.")
+        parser.add_argument(
+            "--no-create", action="store_true", help="Reject rows whose company or department does not exist."
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        self.checkpoint = path.with_name(path.name + ".checkpoint")
+        self.create_missing = not options["no_create"]
+        batch_size = options["batch_size"]
+        resume_after = int(self.checkpoint.read_text()) if options["resume"] and self.checkpoint.exists() else 0
+
+        self.companies = dict(Company.objects.values_list("name", "id"))
+        self.departments = {
+            (company_id, name.lower()): (pk, name)
+            for pk, company_id, name in Department.objects.values_list("id", "company_id", "name")
+        }
+        self.totals = Counter()
+        start = time.perf_counter()
+
+        with path.open(newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise CommandError(f"Missing column(s): {', '.join(missing)}")
+            batch = []
+            for row in reader:
+                line = reader.line_num
+                if line <= resume_after:
+                    continue
+                try:
+                    batch.append((line, self.build(row)))
+                except RowError as e:
+                    self.reject(line, e)
+                if len(batch) >= batch_size:
+                    self.commit(batch)
+                    batch = []
+                    self.progress(start)
+            self.commit(batch)
+
+        dashboard.invalidate()
+        self.checkpoint.unlink(missing_ok=True)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.totals['created']} employee(s), skipped {self.totals['skipped']} existing, "
+                f"rejected {self.totals['rejected']} in {elapsed:.1f}s "
+                f"({self.totals['created'] / elapsed if elapsed else 0:.0f} rows/s)."
+            )
+        )
+
+    def build(self, row):
+        values = {column: (row.get(column) or "").strip() for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+        empty = [column for column in REQUIRED_COLUMNS if not values[column]]
+        if empty:
+            raise RowError(", ".join(f"{column.title()} is required." for column in empty))
+        if not E164_MOBILE_RE.match(values["mobile"]):
+            raise RowError(E164_MOBILE_ERROR)
+        status = values["status"] or Employee.Status.APPLICATION_RECEIVED
+        if status not in STATUSES:
+            raise RowError(f'"{status}" is not a valid status.')
+        try:
+            hired_on = datetime.date.fromisoformat(values["hired_on"]) if values["hired_on"] else None
+        except ValueError:
+            raise RowError(f'Invalid hired_on date "{values["hired_on"]}", expected YYYY-MM-DD.')
+        company_id = self.company_id(values["company"])
+        employee = Employee(
+            company_id=company_id,
+            department_id=self.department_id(company_id, values["department"]),
+            name=values["name"],
+            email=values["email"],
+            mobile=values["mobile"],
+            designation=values["designation"],
+            status=status,
+            address=values["address"],
+            hired_on=hired_on,
+        )
+        employee.set_hired_on()
+        return employee
+
+    def company_id(self, name):
+        if name not in self.companies:
+            if not self.create_missing:
+                raise RowError(f'Company "{name}" does not exist.')
+            self.companies[name] = Company.objects.create(name=name).pk
+        return self.companies[name]
+
+    def department_id(self, company_id, name):
+        key = (company_id, name.lower())
+        if key not in self.departments:
+            if not self.create_missing:
+                raise RowError(f'Department "{name}" does not exist in this company.')
+            self.departments[key] = (Department.objects.create(company_id=company_id, name=name).pk, name)
+        return self.departments[key][0]
+
+    def commit(self, batch):
+        if not batch:
+            return
+        # Rows committed by an interrupted run (before its checkpoint was written) are skipped, not duplicated.
+        existing = set(Employee.objects.filter(email__in=[e.email for _, e in batch]).values_list("email", flat=True))
+        fresh = [(line, e) for line, e in batch if e.email not in existing]
+        self.totals["skipped"] += len(batch) - len(fresh)
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_create([e for _, e in fresh])
+                created = [e for _, e in fresh]
+            except IntegrityError:
+                created = self.insert_one_by_one(fresh)
+            apply_deltas(Company, "num_employees", Counter(e.company_id for e in created))
+            apply_deltas(Department, "num_employees", Counter(e.department_id for e in created))
+            search.index_employees([e.pk for e in created])
+            if created:
+                conditional.bump(Employee)
+        self.totals["created"] += len(created)
+        self.checkpoint.write_text(str(batch[-1][0]))
+
+    def insert_one_by_one(self, rows):
+        """Fallback when a batch violates a unique constraint: find and report the offending rows."""
+        created = []
+        for line, employee in rows:
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_create([employee])
+                created.append(employee)
+            except IntegrityError as e:
+                self.reject(line, RowError(f"Duplicate email, mobile or name in department ({e})."))
+        return created
+
+    def reject(self, line, error):
+        self.totals["rejected"] += 1
+        self.stderr.write(f"Line {line}: {error}")
+
+    def progress(self, start):
+        elapsed = time.perf_counter() - start
+        done = self.totals["created"] + self.totals["skipped"] + self.totals["rejected"]
+        self.stdout.write(f"{done} row(s) processed, {done / elapsed if elapsed else 0:.0f} rows/s")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the employee search index from scratch (after raw SQL edits or restoring a backup)."
+
+    def handle(self, *args, **options):
+        if not search.enabled():
+            self.stdout.write(self.style.WARNING("Search index is only used on SQLite with FTS5; nothing to do."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Indexed {search.rebuild()} employee(s)."))
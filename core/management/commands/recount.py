@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import recount
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized company/department headcounts and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, **options):
+        drift = recount(repair=not options["dry_run"])
+        for counter, rows in drift.items():
+            for pk, stored, actual in rows:
+                self.stdout.write(f"{counter} pk={pk}: stored {stored}, actual {actual}")
+        total = sum(len(rows) for rows in drift.values())
+        if not total:
+            self.stdout.write(self.style.SUCCESS("All counters are correct."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{total} counter(s) drifted (dry run, nothing written)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {total} counter(s)."))
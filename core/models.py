@@ -1,5 +1,5 @@
-from django.db import models
-from django.db.models import UniqueConstraint
+from django.db import models, transaction
+from django.db.models import Index, UniqueConstraint
 from django.db.models.functions import Lower
 from django.conf import settings
 from django.utils import timezone
@@ -8,15 +8,46 @@ import re
 
 LARGE_CHAR_MAX_LENGTH = 255
 SMALL_CHAR_MAX_LENGTH = 30
+E164_MOBILE_RE = re.compile(r"^\+?[1-9]\d{9,14}$")
+E164_MOBILE_ERROR = "Enter a valid E.164 mobile number (e.g., +14155552671)."
 
 
 class BaseModel(models.Model):
     required_fields = []
+    # Field attnames whose as-loaded values are remembered so signal handlers can see what changed on save.
+    tracked_fields = []
+    # Denormalized counters only ever written with F() updates; never overwritten by a plain save().
+    counter_fields = []
+    # Set on every save(); bulk writers set it themselves.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
         ordering = ['-id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_fields()
+        return instance
+
+    def remember_tracked_fields(self):
+        self._loaded_values = {field: self.__dict__[field] for field in self.tracked_fields if field in self.__dict__}
+
+    def loaded_value(self, field, default=None):
+        return getattr(self, '_loaded_values', {}).get(field, default)
+
+    def save(self, *args, **kwargs):
+        if self.counter_fields and not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        # Run post_save handlers (e.g. counter updates) in the same transaction as the write.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+        self.remember_tracked_fields()
+
     def clean(self):
         errors = {}
         for field in self.required_fields:
@@ -28,7 +59,12 @@ class BaseModel(models.Model):
 
 class Company(BaseModel):
     required_fields = ["name"]
+    tracked_fields = ["name"]
+    counter_fields = ["num_departments", "num_employees"]
     name = models.CharField(max_length=LARGE_CHAR_MAX_LENGTH, unique=True)
+    # Denormalized counters maintained by core.signals; repair with `manage.py recount`.
+    num_departments = models.PositiveIntegerField(default=0, editable=False)
+    num_employees = models.PositiveIntegerField(default=0, editable=False)
 
     def delete(self, *args, **kwargs):
         # Prevent deletion if company has departments or employees
@@ -38,24 +74,24 @@ class Company(BaseModel):
             raise ValidationError(f"Cannot delete company '{self.name}' as it has {self.num_employees} employee(s). Please remove all employees first.")
         super().delete(*args, **kwargs)
 
-    @property
-    def num_departments(self):
-        return getattr(self, '_num_departments', Department.objects.filter(company=self).count())
-
-    @property
-    def num_employees(self):
-        return getattr(self, '_num_employees', Employee.objects.filter(company=self).count())
-
     def __str__(self):
         return self.name
 
 
 class Department(BaseModel):
     required_fields = ["company", "name"]
-    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    tracked_fields = ["company_id", "name"]
+    counter_fields = ["num_employees"]
+    # Indexed by the (company, id) composite below rather than a single-column FK index.
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=LARGE_CHAR_MAX_LENGTH)
+    num_employees = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta(BaseModel.Meta):
+        indexes = [
+            # ?company= lists in the default -id order.
+            Index(fields=["company", "id"], name="department_company_id_idx"),
+        ]
         constraints = [
             UniqueConstraint(
                 Lower('name'),
@@ -67,14 +103,9 @@ class Department(BaseModel):
 
     def clean(self):
         super().clean()
-        # Prevent changing company if department has employees
-        if self.pk:  # Only check for existing departments (not new ones)
-            try:
-                old_department = Department.objects.get(pk=self.pk)
-                if old_department.company != self.company and self.num_employees > 0:
-                    raise ValidationError({"company": f"Cannot change company for this department as it has {self.num_employees} employee(s). Please move or remove employees first."})
-            except Department.DoesNotExist:
-                pass  # New department, no constraint needed
+        # Prevent changing company if department has employees (compared with the company it was loaded with)
+        if self.pk and self.loaded_value("company_id", self.company_id) != self.company_id and self.num_employees > 0:
+            raise ValidationError({"company": f"Cannot change company for this department as it has {self.num_employees} employee(s). Please move or remove employees first."})
 
     def delete(self, *args, **kwargs):
         # Prevent deletion if department has employees
@@ -82,16 +113,13 @@ class Department(BaseModel):
             raise ValidationError(f"Cannot delete department '{self.name}' as it has {self.num_employees} employee(s). Please remove all employees first.")
         super().delete(*args, **kwargs)
 
-    @property
-    def num_employees(self):
-        return Employee.objects.filter(department=self).count()
-
     def __str__(self):
         return f"{self.name} ({self.company.name})"
 
 
 class Employee(BaseModel):
     required_fields = ["company", "department", "name", "email", "mobile"]
+    tracked_fields = ["company_id", "department_id"]
 
     class Status(models.TextChoices):
         APPLICATION_RECEIVED = "APPLICATION_RECEIVED", "Application Received"
@@ -99,8 +127,9 @@ class Employee(BaseModel):
         HIRED = "HIRED", "Hired"
         NOT_ACCEPTED = "NOT_ACCEPTED", "Not Accepted"
 
-    company = models.ForeignKey(Company, on_delete=models.PROTECT)
-    department = models.ForeignKey(Department, on_delete=models.PROTECT)
+    # Both FKs are indexed by the composites below rather than single-column FK indexes.
+    company = models.ForeignKey(Company, on_delete=models.PROTECT, db_index=False)
+    department = models.ForeignKey(Department, on_delete=models.PROTECT, db_index=False)
     status = models.CharField(max_length=SMALL_CHAR_MAX_LENGTH, choices=Status.choices, default=Status.APPLICATION_RECEIVED)
     name = models.CharField(max_length=LARGE_CHAR_MAX_LENGTH)
     email = models.EmailField(unique=True)
@@ -110,6 +139,16 @@ class Employee(BaseModel):
     hired_on = models.DateField(null=True, blank=True)
 
     class Meta(BaseModel.Meta):
+        indexes = [
+            # ?company= lists in -id order, company headcounts and the PROTECT check on company delete.
+            Index(fields=["company", "id"], name="employee_company_id_idx"),
+            # ?company=&status= lists.
+            Index(fields=["company", "status", "id"], name="employee_company_status_idx"),
+            # ?department= lists in -id order and the department headcount.
+            Index(fields=["department", "id"], name="employee_department_id_idx"),
+            # ?status= / admin status filter, and hire-date ranges within a status.
+            Index(fields=["status", "hired_on"], name="employee_status_hired_on_idx"),
+        ]
         constraints = [
             UniqueConstraint(
                 Lower('name'),
@@ -124,15 +163,18 @@ class Employee(BaseModel):
         errors = {}
         if self.department and self.company and self.department.company_id != self.company_id:
             errors["department"] = "Department must belong to the selected company."
-        if not re.match(r"^\+?[1-9]\d{9,14}$", self.mobile or ""):
-            errors["mobile"] = "Enter a valid E.164 mobile number (e.g., +14155552671)."
+        if not E164_MOBILE_RE.match(self.mobile or ""):
+            errors["mobile"] = E164_MOBILE_ERROR
         if errors:
             raise ValidationError(errors)
 
-    def save(self, *args, **kwargs):
+    def set_hired_on(self):
         # Automatically set hired_on date when status is 'HIRED' and date is not already set.
         if self.status == self.Status.HIRED and self.hired_on is None:
             self.hired_on = timezone.now().date()
+
+    def save(self, *args, **kwargs):
+        self.set_hired_on()
         super().save(*args, **kwargs)
 
     @property
@@ -143,3 +185,32 @@ class Employee(BaseModel):
 
     def __str__(self):
         return f"{self.name} ({self.company.name} - {self.department.name})"
+
+
+class TableVersion(models.Model):
+    """
+    Per-table change counter for HTTP conditional requests (core.conditional).
+    ``version`` is bumped in the same transaction as every write that changes
+    what the table's endpoints return.
+    """
+    table = models.CharField(max_length=SMALL_CHAR_MAX_LENGTH, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+
+class EmployeeSearchDocument(models.Model):
+    """
+    The SQLite FTS5 index (core.search), mapped read-only so searches can join
+    it. Django neither creates nor migrates it; core.search does.
+    """
+    employee = models.OneToOneField(
+        Employee, primary_key=True, db_column="rowid", on_delete=models.DO_NOTHING,
+        db_constraint=False, related_name="search_document",
+    )
+
+    class Meta:
+        managed = False
+        db_table = "core_employee_fts"
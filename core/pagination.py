@@ -0,0 +1,75 @@
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from . import search
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination seeking on the primary key (matches BaseModel.Meta.ordering)."""
+
+    ordering = "-id"
+
+
+class PageOrCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination by default; switches to keyset mode when the request
+    carries a ``cursor`` query parameter (``?cursor=`` starts at the first page).
+
+    Cursor mode never runs ``COUNT(*)`` and seeks with ``WHERE id < ?`` instead of
+    ``OFFSET``, so deep pages cost the same as the first one. Ranked searches
+    (core.search) ignore ``cursor``: an id keyset would drop their relevance order.
+    """
+
+    cursor_query_param = IdCursorPagination.cursor_query_param
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def use_cursor(self, request, queryset):
+        return self.cursor_query_param in request.query_params and not search.is_ranked(queryset)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request, queryset):
+            self.cursor_paginator = IdCursorPagination()
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset()`` for async views: the COUNT and the page are read with the async ORM."""
+        if self.use_cursor(request, queryset):
+            return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = await queryset.acount()  # a cached_property, so page() below does not count again
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset pagination cursor. Pass an empty value to start; skips the total count.",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -0,0 +1,85 @@
+"""
+Process-wide, build-once responses for data that only changes with a deploy:
+the employee status choices and the OpenAPI schema.
+
+Each entry is rendered to bytes once per process, either by ``warm()`` when
+the WSGI/ASGI application starts or on first use. It is then served as-is with
+a strong ETag and a long ``max-age`` (``PREBUILT_MAX_AGE``). Compressed
+variants are also made once, on first request for each encoding, instead of by
+the compression middleware on every request. Build times are logged.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import get_resolver
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from . import compression
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class Prebuilt:
+    def __init__(self, name, build, content_type="application/json", public=False):
+        self.name = name
+        self.build_content = build
+        self.content_type = content_type
+        # Responses behind authentication are only cached by the browser.
+        self.public = public
+        self.content = self.etag = None
+        self.encoded = {}  # encoding -> compressed content
+        self.lock = threading.Lock()
+
+    def build(self):
+        """Render the content unless this process already has; returns the build time in ms (0 if cached)."""
+        with self.lock:
+            if self.content is not None:
+                return 0.0
+            start = time.perf_counter()
+            content = self.build_content()
+            elapsed = (time.perf_counter() - start) * 1000
+            self.etag = f'"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+            self.content = content
+        logger.info("Built %s (%d bytes) in %.1f ms", self.name, len(content), elapsed)
+        return elapsed
+
+    def response(self, request):
+        if self.content is None:
+            self.build()
+        response = get_conditional_response(request, etag=self.etag)
+        if response is None:
+            response = HttpResponse(self.content, content_type=self.content_type)
+        response["ETag"] = self.etag
+        if response.status_code == 200 and compression.compressible(response):
+            patch_vary_headers(response, ("Accept-Encoding",))
+            encoding = compression.accepted_encoding(request)
+            if encoding is not None:
+                if encoding not in self.encoded:
+                    self.encoded[encoding] = compression.compress(self.content, encoding)
+                response.content = self.encoded[encoding]
+                compression.mark_encoded(response, encoding)
+        visibility = {"public": True} if self.public else {"private": True}
+        patch_cache_control(response, max_age=settings.PREBUILT_MAX_AGE, **visibility)
+        return response
+
+
+def register(name, build, **kwargs):
+    """Declare a prebuilt response; ``build`` returns its bytes and is called at most once per process."""
+    registry[name] = Prebuilt(name, build, **kwargs)
+    return registry[name]
+
+
+def warm():
+    """Build every registered response now, so no request pays for it. Returns ``{name: ms}``."""
+    get_resolver().url_patterns  # imports every URLconf, and with them the views that register entries
+    start = time.perf_counter()
+    timings = {name: entry.build() for name, entry in registry.items()}
+    logger.info("Prebuilt %d response(s) in %.1f ms", len(timings), (time.perf_counter() - start) * 1000)
+    return timings
@@ -0,0 +1,14 @@
+from rest_framework.renderers import JSONRenderer
+
+from . import jsoncodec
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` encoding through ``core.jsoncodec``; indented output (``; indent=4``) keeps DRF's encoder."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return jsoncodec.dumps(data)
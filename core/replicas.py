@@ -0,0 +1,72 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default`` (the primary). Views that use
+``ReplicaReadMixin`` mark their safe read actions (list, retrieve, all,
+dashboard stats) as replica-safe for the duration of the request, and the
+router then spreads those reads over ``settings.DATABASE_REPLICAS``.
+Everything else, including the reads a write does while validating, stays on
+the primary.
+
+A successful write pins the user to the primary for ``REPLICA_PIN_SECONDS``
+so they read their own writes despite replication lag.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+KEY_PREFIX = "db-pin:"
+
+reading_from_replica = ContextVar("reading_from_replica", default=False)
+
+
+def pin_primary(user_id):
+    cache.set(f"{KEY_PREFIX}{user_id}", True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(f"{KEY_PREFIX}{user_id}", False)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Related lookups stay on the database the instance came from.
+            return instance._state.db
+        if settings.DATABASE_REPLICAS and reading_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReplicaReadMixin:
+    """Serve ``replica_actions`` (viewset actions, or method names on a plain APIView) from a replica."""
+
+    replica_actions = ["list", "retrieve", "all"]
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        action = getattr(self, "action", None) or request.method.lower()
+        if request.method in SAFE_METHODS and action in self.replica_actions and not is_pinned(request.user.pk):
+            self.replica_token = reading_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        token = getattr(self, "replica_token", None)
+        if token is not None:
+            reading_from_replica.reset(token)
+            self.replica_token = None
+        elif request.method not in SAFE_METHODS and response.status_code < 400 and request.user.pk:
+            pin_primary(request.user.pk)
+        return response
@@ -0,0 +1,169 @@
+"""
+Employee search backed by an SQLite FTS5 table.
+
+The index holds one row per employee (rowid = employee id) with the name,
+email, designation and company/department names. core.signals keeps it in
+sync on saves, deletes and company/department renames; bulk writers call
+``index_employees()`` or ``rebuild()`` themselves. Searches join it through
+the unmanaged ``EmployeeSearchDocument`` model. On other databases (or an
+SQLite build without FTS5) search falls back to ``icontains`` lookups.
+"""
+
+import logging
+import re
+import sqlite3
+from functools import lru_cache
+
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Company, Department, Employee, EmployeeSearchDocument
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = EmployeeSearchDocument._meta.db_table
+FTS_COLUMNS = ["name", "email", "designation", "company_name", "department_name"]
+# bm25 column weights, same order as FTS_COLUMNS: a name hit outranks an email hit, and so on.
+FTS_WEIGHTS = [10.0, 5.0, 2.0, 1.0, 1.0]
+INDEX_BATCH_SIZE = 500
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@lru_cache(maxsize=None)
+def sqlite_has_fts5():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE probe USING fts5(x)")
+    except sqlite3.OperationalError:
+        logger.warning("SQLite was built without FTS5; employee search falls back to icontains.")
+        return False
+    return True
+
+
+def enabled(conn=None):
+    return (conn or connection).vendor == "sqlite" and sqlite_has_fts5()
+
+
+def create_index(using="default", **kwargs):
+    """
+    post_migrate hook: create the FTS5 table if it does not exist yet, and fill
+    it from the employees already in the database (e.g. after an upgrade).
+    """
+    conn = connections[using]
+    if not enabled(conn) or FTS_TABLE in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    rebuild(using)
+
+
+def source_sql(where):
+    employee, company, department = (model._meta.db_table for model in (Employee, Company, Department))
+    return (
+        f"SELECT e.id, e.name, e.email, e.designation, c.name, d.name FROM {employee} e "
+        f"JOIN {company} c ON c.id = e.company_id JOIN {department} d ON d.id = e.department_id WHERE {where}"
+    )
+
+
+def index_employees(ids):
+    """(Re)index the given employee ids."""
+    if not enabled():
+        return
+    ids = list(ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), INDEX_BATCH_SIZE):
+            batch = ids[start:start + INDEX_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) {source_sql(f'e.id IN ({placeholders})')}",
+                batch,
+            )
+
+
+def unindex_employee(pk):
+    if enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rename(column, fk, pk, name):
+    """Propagate a company or department rename to the indexed rows."""
+    if enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {FTS_TABLE} SET {column} = %s WHERE rowid IN "
+                f"(SELECT id FROM {Employee._meta.db_table} WHERE {fk} = %s)",
+                [name, pk],
+            )
+
+
+def rebuild(using="default"):
+    """Drop and refill the whole index; returns the number of indexed employees."""
+    conn = connections[using]
+    if not enabled(conn):
+        return 0
+    create_index(using)
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) {source_sql('1 = 1')}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def match_expression(text):
+    """Turn free text into an FTS5 query where every word must match as a prefix."""
+    return " ".join(f'"{token}"*' for token in TOKEN_RE.findall(text))
+
+
+def search_employees(queryset, text):
+    """Employees of ``queryset`` where every word of ``text`` prefixes a searched column, best matches first."""
+    text = text.strip()
+    expression = match_expression(text)
+    if not expression:
+        return queryset
+    if not enabled():
+        condition = Q()
+        for token in TOKEN_RE.findall(text):
+            condition &= (
+                Q(name__icontains=token) | Q(email__icontains=token) | Q(designation__icontains=token)
+                | Q(company__name__icontains=token) | Q(department__name__icontains=token)
+            )
+        return queryset.filter(condition)
+    weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+    return (
+        queryset.filter(search_document__isnull=False)  # INNER JOIN on rowid = id
+        .filter(RawSQL(f"{FTS_TABLE} MATCH %s", [expression], output_field=BooleanField()))
+        .annotate(search_rank=RawSQL(f"bm25({FTS_TABLE}, {weights})", [], output_field=FloatField()))
+        .order_by("search_rank", "-id")
+    )
+
+
+def is_ranked(queryset):
+    """Whether ``queryset`` is ordered by search relevance rather than by id."""
+    return "search_rank" in queryset.query.annotations
+
+
+class EmployeeSearchFilter(BaseFilterBackend):
+    """``?search=`` on employees: ranked prefix matches, best first."""
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        return search_employees(queryset, request.query_params.get(self.search_param, ""))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Prefix search over name, email, designation, company and department; ranked.",
+                "schema": {"type": "string"},
+            }
+        ]
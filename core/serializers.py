@@ -1,67 +1,157 @@
+import operator
+from functools import reduce
+
+from django.db import IntegrityError
+from django.db.models import BooleanField, ExpressionWrapper, Q, UniqueConstraint, Value
+from django.db.models.functions import Lower
 from rest_framework import serializers
-from .models import Company, Department, Employee
+from rest_framework.validators import UniqueValidator
+from .sparse import SparseFieldsMixin
+from .models import E164_MOBILE_ERROR, E164_MOBILE_RE, Company, Department, Employee
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     num_departments = serializers.IntegerField(read_only=True)
     num_employees = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Company
         fields = ["id", "name", "num_departments", "num_employees"]
-    
-    def get_num_departments(self, obj):
-        return getattr(obj, '_num_departments', None) or obj.num_departments
-    
-    def get_num_employees(self, obj):
-        return getattr(obj, '_num_employees', None) or obj.num_employees
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class SingleQueryUniqueMixin:
+    """
+    Checks all of the model's uniqueness rules in one query, instead of one
+    UniqueValidator query per field plus hand-written name checks. If a
+    concurrent write wins the race and a database constraint fires anyway, the
+    IntegrityError is turned back into the same field errors.
+
+    "One read plus one write" covers the validation stage and the row write
+    only. Foreign-key lookups and the side effects of a save (counters, table
+    versions, the search index) come on top; WriteValidationTests counts them all.
+
+    ``unique_checks`` maps a field to the fields that scope it; names are
+    compared with Lower() so the lookup hits the functional unique indexes.
+    """
+
+    unique_checks = {}
+    case_insensitive_fields = ["name"]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.unique_checks:
+            fields[name].validators = [v for v in fields[name].validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+    def current(self, data, field):
+        if field in data:
+            return data[field]
+        return getattr(self.instance, field, None)
+
+    def unique_conditions(self, data):
+        conditions = {}
+        for field, scope in self.unique_checks.items():
+            if not any(name in data for name in [field, *scope]):
+                continue  # partial update that leaves this rule untouched
+            values = {name: self.current(data, name) for name in [field, *scope]}
+            if any(value is None for value in values.values()):
+                continue
+            condition = Q(**{name: values[name] for name in scope})
+            if field in self.case_insensitive_fields:
+                condition &= Q(**{f"lower_{field}": Lower(Value(values[field]))})
+            else:
+                condition &= Q(**{field: values[field]})
+            conditions[field] = condition
+        return conditions
+
+    def unique_errors(self, data):
+        conditions = self.unique_conditions(data)
+        if not conditions:
+            return {}
+        model = self.Meta.model
+        queryset = model.objects.annotate(
+            **{f"lower_{field}": Lower(field) for field in conditions if field in self.case_insensitive_fields}
+        ).filter(reduce(operator.or_, conditions.values()))
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        taken = set()
+        flags = {f"{field}_taken": ExpressionWrapper(q, BooleanField()) for field, q in conditions.items()}
+        for row in queryset.values(**flags):
+            taken.update(field for field in conditions if row[f"{field}_taken"])
+        return {field: [self.unique_message(field)] for field in conditions if field in taken}
+
+    def unique_message(self, field):
+        """The message the database constraint or DRF's UniqueValidator would give."""
+        opts = self.Meta.model._meta
+        scope = self.unique_checks[field]
+        if scope:
+            return next(
+                constraint.violation_error_message for constraint in opts.constraints
+                if isinstance(constraint, UniqueConstraint)
+                and scope[0] in [getattr(expression, "name", None) for expression in constraint.expressions]
+            )
+        model_field = opts.get_field(field)
+        return model_field.error_messages["unique"] % {
+            "model_name": opts.verbose_name, "field_label": model_field.verbose_name,
+        }
+
+    def validate(self, data):
+        data = super().validate(data)
+        errors = self.unique_errors(data)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
+
+    def save(self, **kwargs):
+        try:
+            # BaseModel.save() runs in its own atomic block, so a constraint failure is already rolled back.
+            return super().save(**kwargs)
+        except IntegrityError as e:
+            errors = self.unique_errors({**self.validated_data, **kwargs}) or {"non_field_errors": [str(e)]}
+            raise serializers.ValidationError(errors)
+
+
+class DepartmentSerializer(SparseFieldsMixin, SingleQueryUniqueMixin, serializers.ModelSerializer):
     num_employees = serializers.IntegerField(read_only=True)
     company_name = serializers.CharField(source="company.name", read_only=True)
+    unique_checks = {"name": ["company"]}
 
     class Meta:
         model = Department
         fields = ["id", "company", "company_name", "name", "num_employees"]
 
     def validate(self, data):
-        # Case-insensitive uniqueness validation for department name within a company.
-        name = data.get('name')
-        company = data.get('company')
-        if name and company:
-            queryset = Department.objects.filter(company=company, name__iexact=name)
-            if self.instance:
-                queryset = queryset.exclude(pk=self.instance.pk)
-            if queryset.exists():
-                raise serializers.ValidationError({
-                    'name': 'A department with this name already exists in this company.'
-                })
-        return data
+        company = data.get("company")
+        if self.instance and company and company.pk != self.instance.company_id and self.instance.num_employees > 0:
+            raise serializers.ValidationError({
+                "company": f"Cannot change company for this department as it has {self.instance.num_employees} "
+                "employee(s). Please move or remove employees first."
+            })
+        return super().validate(data)
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsMixin, SingleQueryUniqueMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source="company.name", read_only=True)
     department_name = serializers.CharField(source="department.name", read_only=True)
     days_employed = serializers.IntegerField(read_only=True)
+    unique_checks = {"email": [], "mobile": [], "name": ["department"]}
+    source_columns = {"days_employed": ["hired_on"]}
 
     class Meta:
         model = Employee
         fields = '__all__'
 
     def validate(self, data):
-        # Case-insensitive uniqueness validation for employee name within a department.
-        name = data.get('name')
-        department = data.get('department')
-        if name and department:
-            queryset = Employee.objects.filter(department=department, name__iexact=name)
-            if self.instance:
-                queryset = queryset.exclude(pk=self.instance.pk)
-            if queryset.exists():
-                raise serializers.ValidationError({
-                    'name': 'An employee with this name already exists in this department.'
-                })
-        return data
+        # The model's clean() rules, checked here without extra queries.
+        company, department = self.current(data, "company"), self.current(data, "department")
+        errors = {}
+        if company and department and department.company_id != company.pk:
+            errors["department"] = "Department must belong to the selected company."
+        if "mobile" in data and not E164_MOBILE_RE.match(data["mobile"]):
+            errors["mobile"] = E164_MOBILE_ERROR
+        if errors:
+            raise serializers.ValidationError(errors)
+        return super().validate(data)
 
 
 class EmployeeNestedSerializer(serializers.ModelSerializer):
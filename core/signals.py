@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import conditional, dashboard, search
+from .counters import adjust, recount
+from .models import Company, Department, Employee
+
+
+@receiver(post_save, sender=Department)
+def department_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust(Company, instance.company_id, 1, "num_departments")
+        return
+    old_company_id = instance.loaded_value("company_id", instance.company_id)
+    if old_company_id != instance.company_id:
+        adjust(Company, old_company_id, -1, "num_departments")
+        adjust(Company, instance.company_id, 1, "num_departments")
+
+
+@receiver(post_delete, sender=Department)
+def department_deleted(sender, instance, **kwargs):
+    adjust(Company, instance.loaded_value("company_id", instance.company_id), -1, "num_departments")
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust(Company, instance.company_id, 1, "num_employees")
+        adjust(Department, instance.department_id, 1, "num_employees")
+        return
+    old_company_id = instance.loaded_value("company_id", instance.company_id)
+    if old_company_id != instance.company_id:
+        adjust(Company, old_company_id, -1, "num_employees")
+        adjust(Company, instance.company_id, 1, "num_employees")
+    old_department_id = instance.loaded_value("department_id", instance.department_id)
+    if old_department_id != instance.department_id:
+        adjust(Department, old_department_id, -1, "num_employees")
+        adjust(Department, instance.department_id, 1, "num_employees")
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    adjust(Company, instance.loaded_value("company_id", instance.company_id), -1, "num_employees")
+    adjust(Department, instance.loaded_value("department_id", instance.department_id), -1, "num_employees")
+
+
+def changed(instance, *fields):
+    return any(instance.loaded_value(field, getattr(instance, field)) != getattr(instance, field) for field in fields)
+
+
+PLACEMENT_FIELDS = {Department: ["company_id"], Employee: ["company_id", "department_id"]}
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+def invalidate_dashboard(sender, **kwargs):
+    dashboard.invalidate()
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Employee)
+def invalidate_dashboard_on_move(sender, instance, created, **kwargs):
+    # Renames and other edits do not change any dashboard figure; only new rows and moves do.
+    if created or changed(instance, *PLACEMENT_FIELDS[sender]):
+        dashboard.invalidate()
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+def bump_table_version(sender, **kwargs):
+    conditional.bump(sender)
+
+
+@receiver(post_save, sender=Employee)
+def index_employee(sender, instance, **kwargs):
+    search.index_employees([instance.pk])
+
+
+@receiver(post_delete, sender=Employee)
+def unindex_employee(sender, instance, **kwargs):
+    search.unindex_employee(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def reindex_company_name(sender, instance, created, **kwargs):
+    if not created and changed(instance, "name"):
+        search.rename("company_name", "company_id", instance.pk, instance.name)
+
+
+@receiver(post_save, sender=Department)
+def reindex_department_name(sender, instance, created, **kwargs):
+    if not created and changed(instance, "name"):
+        search.rename("department_name", "department_id", instance.pk, instance.name)
+
+
+def create_search_index(sender, **kwargs):
+    search.create_index(kwargs.get("using", "default"))
+
+
+def create_table_versions(sender, **kwargs):
+    conditional.create_versions(kwargs.get("using", "default"))
+
+
+def recount_counters(sender, **kwargs):
+    # The headcount columns start at zero when they are added to an existing database, and the delete
+    # and move guards trust them; fill them in (and repair any drift) after every migrate.
+    recount(using=kwargs.get("using", "default"))
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply the SQLITE_PROFILE pragmas (WAL, synchronous, cache and mmap sizes, busy timeout) per connection."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PROFILES[settings.SQLITE_PROFILE].items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
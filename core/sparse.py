@@ -0,0 +1,106 @@
+"""
+Sparse fieldsets: ``?fields=id,name,email`` renders only those fields and
+``?omit=address`` renders all but those, on list, retrieve, ``all`` and
+``export``.
+
+The SQL follows the fields. Only the columns behind the rendered fields are
+selected (``only()``), and the ``select_related`` joins are dropped unless a
+field reads through them (``company_name``). Fields that are not model
+columns declare the columns they read in the serializer's ``source_columns``;
+if one does not, the query is left as it is.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsMixin:
+    """Serializer side: the top-level serializer renders only ``context["fields"]``; nested ones keep theirs."""
+
+    # Columns read by fields that are not model columns, e.g. properties: {"days_employed": ["hired_on"]}.
+    source_columns = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        wanted = self.context.get("fields")
+        if wanted is None or self.root not in (self, self.parent):
+            return fields
+        return {name: field for name, field in fields.items() if name in wanted}
+
+
+def query_columns(serializer_class, names):
+    """
+    ``(only() paths, select_related names)`` needed to render ``names``, or
+    ``None`` when a field's columns are unknown and the full row must be loaded.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    only, related = set(), set()
+    for name in names:
+        if name in serializer.source_columns:
+            only.update(serializer.source_columns[name])
+            continue
+        source = serializer.fields[name].source.split(".")
+        try:
+            model_field = model._meta.get_field(source[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            continue  # reverse relations are prefetched by the view
+        if len(source) > 1:
+            related.add(source[0])
+        only.add("__".join(source))
+    return only, related
+
+
+class SparseFieldsetMixin:
+    """View side: parses ``?fields=``/``?omit=``, narrows the queryset and passes the fields to the serializer."""
+
+    fields_param = "fields"
+    omit_param = "omit"
+    sparse_actions = ["list", "retrieve", "all", "export"]
+
+    def sparse_fields(self):
+        """Names of the serializer fields to render, or ``None`` for all of them."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = None
+            params = self.request.query_params if self.request is not None else {}
+            if self.action in self.sparse_actions and (self.fields_param in params or self.omit_param in params):
+                available = list(self.get_serializer_class()().fields)
+                requested = {
+                    param: [name.strip() for name in params.get(param, "").split(",") if name.strip()]
+                    for param in (self.fields_param, self.omit_param)
+                }
+                errors = {
+                    param: [f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}."]
+                    for param, names in requested.items()
+                    if (unknown := [name for name in names if name not in available])
+                }
+                if errors:
+                    raise ValidationError(errors)
+                wanted = set(requested[self.fields_param] or available) - set(requested[self.omit_param])
+                self._sparse_fields = [name for name in available if name in wanted]
+        return self._sparse_fields
+
+    def wants(self, name):
+        fields = self.sparse_fields()
+        return fields is None or name in fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.sparse_fields()
+        if fields is None:
+            return queryset
+        columns = query_columns(self.get_serializer_class(), fields)
+        if columns is None:
+            return queryset
+        only, related = columns
+        queryset = queryset.select_related(None).only(*only)
+        # select_related() without arguments would follow every foreign key.
+        return queryset.select_related(*related) if related else queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.sparse_fields() is not None:
+            context["fields"] = self.sparse_fields()
+        return context
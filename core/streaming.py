@@ -0,0 +1,116 @@
+import csv
+import logging
+import time
+
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+from . import jsoncodec
+
+logger = logging.getLogger(__name__)
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula (CSV injection).
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Advertises newline-delimited JSON so content negotiation accepts it; rows are streamed by the view."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b"".join(ndjson_stream(data if isinstance(data, list) else [data]))
+
+
+class CSVRenderer(BaseRenderer):
+    """Advertises CSV so content negotiation accepts it; exports are streamed by the view."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        header = list(rows[0]) if rows else []
+        return "".join(csv_stream(header, rows)).encode(self.charset)
+
+
+class Echo:
+    """File-like object whose write() hands the line back, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def iter_serialized(serializer_class, queryset, context, chunk_size):
+    """Yield serialized rows, reading and serializing ``chunk_size`` rows at a time."""
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield from serializer_class(chunk, many=True, context=context).data
+            chunk = []
+    if chunk:
+        yield from serializer_class(chunk, many=True, context=context).data
+
+
+def json_array_stream(rows):
+    yield b"["
+    for index, row in enumerate(rows):
+        yield (b"," if index else b"") + jsoncodec.dumps(row)
+    yield b"]"
+
+
+def ndjson_stream(rows):
+    for row in rows:
+        yield jsoncodec.dumps(row) + b"\n"
+
+
+def csv_cell(value):
+    """``value``, prefixed with ``'`` when a spreadsheet would otherwise run it as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_stream(header, rows, label="rows"):
+    """Yield CSV lines for ``rows`` (dicts), logging throughput once the stream is exhausted."""
+    writer = csv.writer(Echo())
+    start = time.perf_counter()
+    count = 0
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([csv_cell(row.get(column)) for column in header])
+        count += 1
+    elapsed = time.perf_counter() - start
+    logger.info("Exported %d %s in %.2fs (%.0f rows/s)", count, label, elapsed, count / elapsed if elapsed else 0)
+
+
+class StreamAllMixin:
+    """
+    Adds an ``all`` list action that streams every row instead of building the
+    full list in memory. Responds with a JSON array, or NDJSON when the client
+    sends ``Accept: application/x-ndjson``.
+    """
+
+    stream_chunk_size = 500
+
+    def serialized_rows(self, queryset):
+        """Serialized dicts for every row of ``queryset``, read in ``stream_chunk_size`` chunks."""
+        return iter_serialized(
+            self.get_serializer_class(), queryset, self.get_serializer_context(), self.stream_chunk_size
+        )
+
+    @action(detail=False, methods=["get"], renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer])
+    def all(self, request):
+        # Bind the database now: the rows are read after the view returns, outside any per-request routing.
+        queryset = self.get_queryset()
+        queryset = queryset.using(queryset.db)
+        rows = self.serialized_rows(queryset)
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return StreamingHttpResponse(ndjson_stream(rows), content_type=NDJSONRenderer.media_type)
+        return StreamingHttpResponse(json_array_stream(rows), content_type="application/json")
@@ -1,3 +1,1135 @@
-from django.test import TestCase
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import os
+import random
+import re
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from . import admin, compression, conditional, dashboard, fastpath, jsoncodec, prebuilt, search
+from .counters import recount
+from .loadgen import company_sizes
+from .models import Company, Department, Employee
+from .serializers import (
+    CompanyDetailSerializer, CompanySerializer, DepartmentSerializer, EmployeeSerializer,
+)
+
+
+class CoreAPITestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@test.com", password="test", role=User.Role.ADMIN)
+        cls.company = Company.objects.create(name="Acme")
+        cls.department = Department.objects.create(company=cls.company, name="Engineering")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.admin)
+
+    @classmethod
+    def create_employees(cls, count, department=None, start=0):
+        department = department or cls.department
+        employees = Employee.objects.bulk_create(
+            [
+                Employee(
+                    company_id=department.company_id,
+                    department=department,
+                    name=f"Employee {i}",
+                    email=f"employee{i}@test.com",
+                    mobile=f"+1555{i:07d}",
+                    designation="Engineer",
+                )
+                for i in range(start, start + count)
+            ]
+        )
+        recount()  # bulk_create bypasses the counter, search and table version signals
+        search.rebuild()
+        conditional.bump(Employee)
+        return employees
+
+
+class CursorPaginationTests(CoreAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_employees(25)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get("/api/employees/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+
+    def test_cursor_mode_walks_all_rows_without_count(self):
+        seen = []
+        url = "/api/employees/?cursor="
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        expected = list(Employee.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_cursor_mode_on_companies_and_departments(self):
+        for url in ("/api/companies/?cursor=", "/api/departments/?cursor="):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), 1)
+
+
+class StreamingAllTests(CoreAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_employees(7)
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_all_streams_json_array(self):
+        response = self.client.get("/api/employees/all/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        rows = json.loads(self.read(response))
+        self.assertEqual([row["id"] for row in rows], list(Employee.objects.values_list("id", flat=True)))
+        self.assertEqual(rows[0]["company_name"], "Acme")
+
+    def test_all_streams_ndjson(self):
+        response = self.client.get("/api/departments/all/", HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = self.read(response).splitlines()
+        self.assertEqual([json.loads(line)["name"] for line in lines], ["Engineering"])
+
+    def test_all_with_no_rows_is_empty_array(self):
+        Employee.objects.all().delete()
+        self.assertEqual(self.read(self.client.get("/api/employees/all/")), "[]")
+
+
+class QueryCountTests(CoreAPITestCase):
+    """Read endpoints must issue a constant number of queries regardless of row count."""
+
+    urls = [
+        "/api/companies/",
+        "/api/companies/all/",
+        "/api/departments/",
+        "/api/departments/all/",
+        "/api/employees/",
+        "/api/employees/all/",
+        "/api/companies/{company}/",
+        "/api/departments/{department}/",
+    ]
+
+    def query_counts(self):
+        counts = {}
+        for url in self.urls:
+            url = url.format(company=self.company.pk, department=self.department.pk)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = len(ctx.captured_queries)
+        return counts
+
+    def add_rows(self, start):
+        company = Company.objects.create(name=f"Company {start}")
+        for i in range(3):
+            department = Department.objects.create(company=company, name=f"Department {i}")
+            self.create_employees(3, department=department, start=start + i * 3)
+        self.create_employees(3, start=start + 100)
+
+    def test_read_queries_do_not_grow_with_rows(self):
+        self.add_rows(0)
+        baseline = self.query_counts()
+        self.add_rows(1000)
+        self.add_rows(2000)
+        self.assertEqual(self.query_counts(), baseline)
+
+
+class IndexUsageTests(CoreAPITestCase):
+    """Every query behind the filtered lists and uniqueness checks must be an index search, not a table scan."""
+
+    requests = [
+        ("get", "/api/employees/?company={company}", None),
+        ("get", "/api/employees/?company={company}&status=HIRED", None),
+        ("get", "/api/employees/?department={department}", None),
+        ("get", "/api/employees/?status=HIRED", None),
+        ("get", "/api/employees/?company={company}&cursor=", None),
+        ("get", "/api/departments/?company={company}", None),
+        ("post", "/api/departments/", {"company": "{company}", "name": "Support"}),
+        ("post", "/api/employees/", {
+            "company": "{company}", "department": "{department}", "name": "Ann", "email": "ann@test.com",
+            "mobile": "+14155550001", "designation": "Engineer",
+        }),
+    ]
+    full_scan = re.compile(r"^SCAN (core_employee|core_department)\b")
+
+    def plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def test_hot_queries_use_indexes(self):
+        self.create_employees(5)
+        ids = {"company": self.company.pk, "department": self.department.pk}
+        used = set()
+        for method, url, data in self.requests:
+            data = {key: str(value).format(**ids) for key, value in (data or {}).items()}
+            with CaptureQueriesContext(connection) as ctx:
+                response = getattr(self.client, method)(url.format(**ids), data)
+            self.assertLess(response.status_code, 400, url)
+            for query in ctx.captured_queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                steps = self.plan(query["sql"])
+                used.update(steps)
+                scans = [step for step in steps if self.full_scan.match(step)]
+                self.assertEqual(scans, [], f"{method.upper()} {url}: {query['sql']}")
+        # The case-insensitive name checks go through the functional unique indexes.
+        for index in ("unique_department_name_in_company", "unique_employee_name_in_department"):
+            self.assertTrue(any(index in step for step in used), index)
+
+
+class WriteValidationTests(CoreAPITestCase):
+    """
+    Validation is one uniqueness query; the row itself is one INSERT/UPDATE.
+    The whole request is counted too, so a new side-effect query fails here.
+    """
+
+    def employee_row(self, **overrides):
+        return {
+            "company": self.company.pk, "department": self.department.pk, "name": "Ann", "email": "ann@test.com",
+            "mobile": "+14155550001", "designation": "Engineer", **overrides,
+        }
+
+    def table_queries(self, ctx, table):
+        """(reads, writes) issued against ``table`` itself."""
+        sqls = [query["sql"] for query in ctx.captured_queries]
+        reads = [sql for sql in sqls if sql.startswith("SELECT") and f'FROM "{table}"' in sql]
+        writes = [sql for sql in sqls if sql.startswith((f'INSERT INTO "{table}"', f'UPDATE "{table}"'))]
+        return len(reads), len(writes)
+
+    def test_employee_writes_use_one_read_and_one_write(self):
+        # On top of the uniqueness SELECT and the INSERT: the company and department lookups for the
+        # foreign keys, BaseModel.save()'s SAVEPOINT/RELEASE, the two counter UPDATEs, three
+        # TableVersion bumps (employee, company, department) and the search index DELETE + INSERT.
+        with self.assertNumQueries(13) as ctx:
+            response = self.client.post("/api/employees/", self.employee_row())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.table_queries(ctx, "core_employee"), (1, 1))
+
+        # get_object() plus the uniqueness check, then the UPDATE; SAVEPOINT/RELEASE, one TableVersion
+        # bump and the search index DELETE + INSERT.
+        with self.assertNumQueries(8) as ctx:
+            response = self.client.patch(f"/api/employees/{response.data['id']}/", {"name": "Ann Lee"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.table_queries(ctx, "core_employee"), (2, 1))
+
+        with self.assertNumQueries(7) as ctx:
+            response = self.client.patch(f"/api/employees/{response.data['id']}/", {"designation": "Lead"})
+        self.assertEqual(self.table_queries(ctx, "core_employee"), (1, 1))  # no unique field touched, no check
+
+    def test_department_update_uses_one_read_and_one_write(self):
+        # get_object(), the uniqueness check and the UPDATE; SAVEPOINT/RELEASE, one TableVersion bump
+        # and the rename pushed into the search index.
+        with self.assertNumQueries(7) as ctx:
+            response = self.client.patch(f"/api/departments/{self.department.pk}/", {"name": "Platform"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.table_queries(ctx, "core_department"), (2, 1))
+
+    def test_every_conflict_is_reported_from_one_query(self):
+        self.client.post("/api/employees/", self.employee_row())
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post("/api/employees/", self.employee_row(name="ANN"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {
+            "email": ["employee with this email already exists."],
+            "mobile": ["employee with this mobile already exists."],
+            "name": ["An employee with this name already exists in this department."],
+        })
+        self.assertEqual(self.table_queries(ctx, "core_employee"), (1, 0))
+
+        other = Department.objects.create(company=Company.objects.create(name="Globex"), name="Sales")
+        response = self.client.post("/api/employees/", self.employee_row(department=other.pk, email="b@test.com"))
+        self.assertEqual(response.data, {"department": ["Department must belong to the selected company."]})
+        response = self.client.post("/api/departments/", {"company": self.company.pk, "name": "ENGINEERING"})
+        self.assertEqual(response.data, {"name": ["A department with this name already exists in this company."]})
+
+    def test_department_with_employees_cannot_change_company(self):
+        self.create_employees(1)
+        other = Company.objects.create(name="Globex")
+        response = self.client.patch(f"/api/departments/{self.department.pk}/", {"company": other.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Cannot change company", response.data["company"][0])
+
+    def test_constraint_violation_from_a_race_maps_to_field_errors(self):
+        self.client.post("/api/employees/", self.employee_row())
+        # Simulate a concurrent insert landing between validation and save.
+        real = EmployeeSerializer.unique_errors
+        calls = []
+
+        def unique_errors(serializer, data):
+            calls.append(data)
+            return {} if len(calls) == 1 else real(serializer, data)
+
+        with mock.patch.object(EmployeeSerializer, "unique_errors", unique_errors):
+            response = self.client.post("/api/employees/", self.employee_row(mobile="+14155550002", name="Bo"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"email": ["employee with this email already exists."]})
+        self.assertEqual(Employee.objects.count(), 1)
+
+
+class SQLiteTuningTests(CoreAPITestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_profile_pragmas_are_applied_to_connections(self):
+        profile = settings.SQLITE_PROFILES["tuned"]
+        self.assertEqual(settings.SQLITE_PROFILE, "tuned")
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma("cache_size"), profile["cache_size"])
+        self.assertEqual(self.pragma("busy_timeout"), profile["busy_timeout"])
+        self.assertEqual(self.pragma("temp_store"), 2)  # MEMORY
+        # The in-memory test database cannot use WAL; a file database can.
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {**connection.settings_dict, "NAME": str(Path(directory) / "wal.sqlite3")}
+            other = type(connections["default"])(settings_dict)
+            try:
+                with other.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], "wal")
+            finally:
+                other.close()
+
+
+class CounterTests(CoreAPITestCase):
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        self.assertEqual({field: getattr(obj, field) for field in expected}, expected)
+
+    def make_employee(self, department, suffix="1"):
+        return Employee.objects.create(
+            company=department.company,
+            department=department,
+            name=f"Jane {suffix}",
+            email=f"jane{suffix}@test.com",
+            mobile=f"+1415555{suffix:0>4}",
+            designation="Engineer",
+        )
+
+    def test_create_move_and_delete_employee(self):
+        other_company = Company.objects.create(name="Globex")
+        other_department = Department.objects.create(company=other_company, name="Sales")
+        self.assertCounts(other_company, num_departments=1, num_employees=0)
+
+        employee = self.make_employee(self.department)
+        self.assertCounts(self.company, num_departments=1, num_employees=1)
+        self.assertCounts(self.department, num_employees=1)
+
+        employee = Employee.objects.get(pk=employee.pk)
+        employee.company = other_company
+        employee.department = other_department
+        employee.save()
+        self.assertCounts(self.company, num_employees=0)
+        self.assertCounts(self.department, num_employees=0)
+        self.assertCounts(other_company, num_employees=1)
+        self.assertCounts(other_department, num_employees=1)
+
+        employee.delete()
+        self.assertCounts(other_company, num_employees=0)
+        self.assertCounts(other_department, num_employees=0)
+
+    def test_api_writes_keep_counters(self):
+        response = self.client.post("/api/departments/", {"company": self.company.pk, "name": "Support"})
+        self.assertEqual(response.status_code, 201)
+        self.assertCounts(self.company, num_departments=2)
+        self.client.delete(f"/api/departments/{response.data['id']}/")
+        self.assertCounts(self.company, num_departments=1)
+
+    def test_stale_instance_save_does_not_clobber_counter(self):
+        department = Department.objects.get(pk=self.department.pk)
+        self.make_employee(self.department)
+        department.name = "Platform"
+        department.save()
+        self.assertCounts(self.department, name="Platform", num_employees=1)
+
+    def test_recount_command_repairs_drift(self):
+        self.make_employee(self.department)
+        Company.objects.update(num_employees=7)
+        Department.objects.update(num_employees=0)
+        out = StringIO()
+        call_command("recount", "--dry-run", stdout=out)
+        self.assertIn("2 counter(s) drifted", out.getvalue())
+        self.assertCounts(self.company, num_employees=7)
+        call_command("recount", stdout=out)
+        self.assertCounts(self.company, num_departments=1, num_employees=1)
+        self.assertCounts(self.department, num_employees=1)
+        self.assertEqual(sum(map(len, recount(repair=False).values())), 0)
+
+    def test_migrate_fills_in_counters(self):
+        # As on a database that predates the counter columns.
+        self.make_employee(self.department)
+        Company.objects.update(num_departments=0, num_employees=0)
+        Department.objects.update(num_employees=0)
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        self.assertCounts(self.company, num_departments=1, num_employees=1)
+        self.assertCounts(self.department, num_employees=1)
+
+    def test_delete_with_stale_counters_is_refused(self):
+        self.make_employee(self.department)
+        Company.objects.update(num_departments=0, num_employees=0)
+        Department.objects.update(num_employees=0)
+        for url in (f"/api/departments/{self.department.pk}/", f"/api/companies/{self.company.pk}/"):
+            response = self.client.delete(url)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn("protected", response.data["detail"])
+        self.assertTrue(Department.objects.filter(pk=self.department.pk).exists())
+
+
+class DashboardStatsTests(CoreAPITestCase):
+    url = "/api/dashboard-stats/"
+
+    def test_snapshot_is_cached_and_invalidated_by_writes(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(first.data["stats"], {"companies": 1, "departments": 1, "employees": 0})
+        self.assertEqual(first.data["chart_data"]["departments_per_company"], [{"name": "Acme", "department_count": 1}])
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(second["X-Cache-Hit-Rate"], "0.500")
+        self.assertIn("X-Cache-Age", second)
+
+        Employee.objects.create(
+            company=self.company, department=self.department, name="Jane", email="jane@test.com",
+            mobile="+14155550100", designation="Engineer",
+        )
+        third = self.client.get(self.url)
+        self.assertEqual(third["X-Cache"], "MISS")
+        self.assertEqual(third.data["stats"]["employees"], 1)
+        self.assertEqual(third.data["chart_data"]["employees_per_company"], [{"name": "Acme", "employee_count": 1}])
+
+    def test_edits_that_do_not_change_stats_keep_snapshot(self):
+        self.client.get(self.url)
+        department = Department.objects.get(pk=self.department.pk)
+        department.name = "Platform"
+        department.save()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+        self.company.name = "Acme Corp"
+        self.company.save()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+
+    def test_snapshot_is_short_lived_on_a_per_process_cache(self):
+        self.assertEqual(dashboard.snapshot_timeout(), dashboard.LOCAL_SNAPSHOT_TIMEOUT)
+        with tempfile.TemporaryDirectory() as directory:
+            shared = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}}
+            with override_settings(CACHES=shared):
+                self.assertEqual(dashboard.snapshot_timeout(), dashboard.SNAPSHOT_TIMEOUT)
+
+
+class EmployeeBulkTests(CoreAPITestCase):
+    url = "/api/employees/bulk/"
+
+    def row(self, i, **overrides):
+        row = {
+            "company": self.company.pk,
+            "department": self.department.pk,
+            "name": f"Bulk {i}",
+            "email": f"bulk{i}@test.com",
+            "mobile": f"+1666{i:07d}",
+            "designation": "Engineer",
+        }
+        row.update(overrides)
+        return row
+
+    def post(self, rows, **params):
+        query = "".join(f"&{key}={value}" for key, value in params.items())
+        return self.client.post(f"{self.url}?{query.lstrip('&')}", rows, format="json")
+
+    def test_creates_rows_and_reports_per_row_errors(self):
+        self.create_employees(1)
+        rows = [
+            self.row(1, status="HIRED"),
+            self.row(2, mobile="12"),
+            self.row(3, name="employee 0"),
+            self.row(4, email="bulk1@test.com"),
+            self.row(5, department=999),
+            self.row(6, mobile="+15550000000"),
+            self.row(7),
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["updated"]), (2, 0))
+        self.assertEqual(
+            {error["index"]: list(error["errors"]) for error in response.data["errors"]},
+            {1: ["mobile"], 2: ["name"], 3: ["email"], 4: ["department"], 5: ["mobile"]},
+        )
+        hired = Employee.objects.get(email="bulk1@test.com")
+        self.assertIsNotNone(hired.hired_on)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.num_employees, 3)
+
+    def test_upsert_updates_and_moves_existing_rows(self):
+        other = Department.objects.create(company=self.company, name="Sales")
+        self.post([self.row(1), self.row(2)])
+        response = self.post([self.row(1, department=other.pk, designation="Lead"), self.row(3)])
+        self.assertEqual((response.data["created"], response.data["updated"]), (1, 1))
+        moved = Employee.objects.get(email="bulk1@test.com")
+        self.assertEqual((moved.department_id, moved.designation), (other.pk, "Lead"))
+        other.refresh_from_db()
+        self.department.refresh_from_db()
+        self.assertEqual((other.num_employees, self.department.num_employees), (1, 2))
+
+    def test_modes(self):
+        self.post([self.row(1)])
+        self.assertEqual(list(self.post([self.row(1)], mode="create").data["errors"][0]["errors"]), ["email"])
+        self.assertEqual(list(self.post([self.row(2)], mode="update").data["errors"][0]["errors"]), ["email"])
+        self.assertEqual(self.post([self.row(2)], mode="merge").status_code, 400)
+
+    def test_accepts_ndjson(self):
+        body = "\n".join(json.dumps(self.row(i)) for i in range(3))
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.data["created"], 3)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def queries(rows):
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.post(rows).status_code, 200)
+            return len(ctx.captured_queries)
+
+        small = queries([self.row(i) for i in range(2)])
+        large = queries([self.row(i) for i in range(100, 160)])
+        self.assertEqual(small, large)
+
+
+class EmployeeExportTests(CoreAPITestCase):
+    def test_export_streams_filtered_csv_with_api_columns(self):
+        other = Department.objects.create(company=self.company, name="Sales")
+        self.create_employees(3)
+        self.create_employees(2, department=other, start=10)
+        formula = '=HYPERLINK("http://evil.test","click")'
+        newest = Employee.objects.filter(department=other).first()  # rows[0] below: both are in -id order
+        Employee.objects.filter(pk=newest.pk).update(name=formula, designation="@SUM(A1)")
+        response = self.client.get(f"/api/employees/export/?department={other.pk}", HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["department_name"] for row in rows], ["Sales", "Sales"])
+        self.assertEqual(rows[0]["company_name"], "Acme")
+        self.assertEqual(rows[0]["days_employed"], "0")
+        self.assertEqual(list(rows[0]), list(EmployeeSerializer().fields))
+        # Formula-looking text is exported as text.
+        self.assertEqual(rows[0]["name"], "'" + formula)
+        self.assertEqual(rows[0]["designation"], "'@SUM(A1)")
+        self.assertTrue(rows[0]["mobile"].startswith("'+"))
+
+
+class ImportEmployeesCommandTests(CoreAPITestCase):
+    header = "name,email,mobile,company,department,designation,status,hired_on\n"
+
+    def write_csv(self, lines):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "employees.csv"
+        path.write_text(self.header + "".join(line + "\n" for line in lines))
+        return path
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_employees", str(path), "--batch-size", "2", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_imports_in_batches_and_reports_bad_rows(self):
+        path = self.write_csv([
+            "Ann,ann@test.com,+14155550001,Acme,engineering,Engineer,HIRED,",
+            "Bob,bob@test.com,12345,Acme,Engineering,Engineer,,",
+            "Cat,cat@test.com,+14155550003,Globex,Sales,Analyst,,2024-01-31",
+            "Dan,ann@test.com,+14155550004,Acme,Engineering,Engineer,,",
+            "Eve,eve@test.com,+14155550005,Acme,Engineering,Engineer,BOGUS,",
+            "Fay,fay@test.com,+14155550001,Acme,Engineering,Engineer,,",
+        ])
+        out, err = self.run_import(path)
+        self.assertIn("Imported 2 employee(s), skipped 1 existing, rejected 3", out)
+        self.assertIn("Line 3: Enter a valid E.164", err)
+        self.assertIn("Line 6: \"BOGUS\" is not a valid status.", err)
+        self.assertIn("Line 7: Duplicate email, mobile or name", err)
+        self.assertEqual(Employee.objects.get(email="ann@test.com").department_id, self.department.pk)
+        self.assertIsNotNone(Employee.objects.get(email="ann@test.com").hired_on)
+        globex = Company.objects.get(name="Globex")
+        self.assertEqual((globex.num_departments, globex.num_employees), (1, 1))
+        self.assertEqual(sum(map(len, recount(repair=False).values())), 0)
+        self.assertFalse(path.with_name("employees.csv.checkpoint").exists())
+
+    def test_resume_skips_checkpointed_and_existing_rows(self):
+        path = self.write_csv([
+            "Ann,ann@test.com,+14155550001,Acme,Engineering,Engineer,,",
+            "Bob,bob@test.com,+14155550002,Acme,Engineering,Engineer,,",
+            "Cat,cat@test.com,+14155550003,Acme,Engineering,Engineer,,",
+        ])
+        Employee.objects.create(
+            company=self.company, department=self.department, name="Bob", email="bob@test.com",
+            mobile="+14155550002", designation="Engineer",
+        )
+        path.with_name("employees.csv.checkpoint").write_text("2")
+        out, _ = self.run_import(path, "--resume")
+        self.assertIn("Imported 1 employee(s), skipped 1 existing", out)
+        self.assertFalse(Employee.objects.filter(email="ann@test.com").exists())
+
+
+class GenerateLoadDataTests(CoreAPITestCase):
+    def test_generates_skewed_deterministic_dataset(self):
+        self.assertEqual(
+            company_sizes(10, 500, random.Random(3)), company_sizes(10, 500, random.Random(3))
+        )
+        call_command("generate_load_data", "--companies", "5", "--employees", "300", "--skip-demo", stdout=StringIO())
+        sizes = list(
+            Company.objects.filter(name__startswith="Load Co").order_by("name").values_list("num_employees", flat=True)
+        )
+        self.assertEqual(sum(sizes), 300)
+        self.assertEqual(sizes[0], max(sizes))
+        self.assertEqual(sum(map(len, recount(repair=False).values())), 0)
+        with self.assertRaises(CommandError):
+            call_command("generate_load_data", "--companies", "5", "--employees", "10", "--skip-demo", stdout=StringIO())
+
+
+class EmployeeSearchTests(CoreAPITestCase):
+    url = "/api/employees/"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.alice = Employee.objects.create(
+            company=cls.company, department=cls.department, name="Alice Martin", email="amartin@test.com",
+            mobile="+14155550101", designation="Engineer",
+        )
+        cls.bob = Employee.objects.create(
+            company=cls.company, department=cls.department, name="Bob Stone", email="alice.fan@test.com",
+            mobile="+14155550102", designation="Analyst",
+        )
+
+    def search(self, text, **params):
+        response = self.client.get(self.url, {"search": text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.data["results"]]
+
+    def test_prefix_search_ranks_name_matches_first(self):
+        self.assertEqual(self.search("ali"), ["Alice Martin", "Bob Stone"])
+        self.assertEqual(self.search("ali mart"), ["Alice Martin"])
+        # "eng" also prefixes Alice's designation, so she outranks a department-only match.
+        self.assertEqual(self.search("acme eng", status=Employee.Status.APPLICATION_RECEIVED), ["Alice Martin", "Bob Stone"])
+        self.assertEqual(self.search("nobody"), [])
+        self.assertEqual(self.search('ali" OR *'), [])  # FTS5 syntax is quoted away, not an error
+
+    def test_index_follows_updates_renames_and_deletes(self):
+        self.client.patch(f"{self.url}{self.bob.pk}/", {"designation": "Architect"})
+        self.assertEqual(self.search("archi"), ["Bob Stone"])
+        self.client.patch(f"/api/departments/{self.department.pk}/", {"name": "Platform"})
+        self.assertCountEqual(self.search("platf"), ["Alice Martin", "Bob Stone"])
+        self.assertEqual(self.search("engineering"), [])
+        self.client.delete(f"{self.url}{self.alice.pk}/")
+        self.assertEqual(self.search("ali"), ["Bob Stone"])
+
+    def test_bulk_writes_are_indexed(self):
+        row = {
+            "company": self.company.pk, "department": self.department.pk, "name": "Zed Quinn",
+            "email": "zed@test.com", "mobile": "+14155550103", "designation": "Engineer",
+        }
+        self.client.post(f"{self.url}bulk/", [row], format="json")
+        self.assertEqual(self.search("quin"), ["Zed Quinn"])
+        self.client.post(f"{self.url}bulk/", [{**row, "designation": "Director"}], format="json")
+        self.assertEqual(self.search("direc"), ["Zed Quinn"])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.FTS_TABLE}")
+        self.assertEqual(self.search("ali"), [])
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 2 employee(s).", out.getvalue())
+        self.assertEqual(self.search("ali"), ["Alice Martin", "Bob Stone"])
+
+    def test_index_is_filled_when_created(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {search.FTS_TABLE}")
+        search.create_index()
+        self.assertEqual(self.search("ali"), ["Alice Martin", "Bob Stone"])
+
+    def test_ranked_search_ignores_cursor(self):
+        # Bob has the higher id, so keyset order would list him first.
+        response = self.client.get(self.url, {"search": "ali", "cursor": ""})
+        self.assertEqual([row["name"] for row in response.data["results"]], ["Alice Martin", "Bob Stone"])
+        self.assertEqual(response.data["count"], 2)
+
+
+class SparseFieldsetTests(CoreAPITestCase):
+    def get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        rows = [q["sql"] for q in ctx.captured_queries if 'FROM "core_employee"' in q["sql"] and "COUNT(" not in q["sql"]]
+        return response, rows
+
+    def test_fields_narrow_the_columns_and_joins(self):
+        self.create_employees(3)
+        response, [sql] = self.get("/api/employees/?fields=id,name,days_employed")
+        self.assertEqual(list(response.data["results"][0]), ["id", "days_employed", "name"])
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn('"address"', sql)
+        self.assertIn('"hired_on"', sql)
+
+        response, [sql] = self.get("/api/employees/?fields=department_name")
+        self.assertEqual(response.data["results"][0], {"department_name": "Engineering"})
+        self.assertIn('JOIN "core_department"', sql)
+        self.assertNotIn('"core_company"', sql)
+
+    def test_omit(self):
+        self.create_employees(1)
+        response, [sql] = self.get("/api/employees/?omit=address, company_name,department_name")
+        self.assertNotIn("address", response.data["results"][0])
+        self.assertIn("email", response.data["results"][0])
+        self.assertNotIn("JOIN", sql)
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/employees/?fields=id,salary")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("salary", response.data["fields"][0])
+
+    def test_detail_skips_unrequested_prefetches(self):
+        self.create_employees(2)
+        with self.assertNumQueries(2):  # table versions + the company row
+            response = self.client.get(f"/api/companies/{self.company.pk}/?fields=id,name")
+        self.assertEqual(response.data, {"id": self.company.pk, "name": "Acme"})
+        self.assertEqual(len(self.client.get(f"/api/companies/{self.company.pk}/?omit=name").data["departments"]), 1)
+
+    def test_export_and_all(self):
+        self.create_employees(2)
+        response = self.client.get("/api/employees/export/?fields=id,email", HTTP_ACCEPT="text/csv")
+        self.assertEqual(b"".join(response.streaming_content).decode().splitlines()[0], "id,email")
+        response = self.client.get("/api/employees/all/?fields=email")
+        self.assertEqual(json.loads(b"".join(response.streaming_content))[0], {"email": "employee1@test.com"})
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post("/api/companies/?fields=id", {"name": "Initech"})
+        self.assertEqual(set(response.data), {"id", "name", "num_departments", "num_employees"})
+
+
+class FastPathParityTests(CoreAPITestCase):
+    """The values() fast path must render exactly what the serializers render."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_employees(5)
+        Employee.objects.filter(pk__in=Employee.objects.order_by("id").values("pk")[:2]).update(
+            status=Employee.Status.HIRED, hired_on=datetime.date(2020, 2, 29), address="Zürich\n\"Quoted\" — ✓",
+        )
+        Company.objects.create(name="Émigré & Søn")
+
+    def test_serializers(self):
+        for serializer_class, queryset in [
+            (CompanySerializer, Company.objects.all()),
+            (DepartmentSerializer, Department.objects.select_related("company")),
+            (EmployeeSerializer, Employee.objects.select_related("company", "department")),
+        ]:
+            for names in [None, ("id", "days_employed", "hired_on"), ("company_name",)]:
+                if names and not set(names) <= set(serializer_class().fields):
+                    continue
+                fast = fastpath.compile_serializer(serializer_class, names)
+                context = {"fields": list(names)} if names else {}
+                expected = JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+                self.assertEqual(JSONRenderer().render(fast.rows(fast.values(queryset))), expected)
+
+    def test_endpoints(self):
+        urls = ["/api/companies/", "/api/departments/", "/api/employees/?page=1", "/api/employees/?cursor=",
+                "/api/employees/?search=employee", "/api/employees/?fields=name,days_employed", "/api/employees/all/"]
+        for url in urls:
+            fast = self.client.get(url)
+            with mock.patch.object(fastpath, "compile_serializer", return_value=None):
+                cache.clear()
+                slow = self.client.get(url)
+            content = b"".join(fast.streaming_content) if fast.streaming else fast.content
+            expected = b"".join(slow.streaming_content) if slow.streaming else slow.content
+            self.assertEqual(content, expected, url)
+
+    def test_cursor_pages_without_the_id_field(self):
+        self.create_employees(20, start=100)
+        for url in ["/api/employees/?cursor=&fields=name", "/api/employees/?cursor=&omit=id",
+                    "/api/employees/?search=employee&cursor=&fields=name"]:
+            pages = 0
+            while url:
+                fast = self.client.get(url)
+                with mock.patch.object(fastpath, "compile_serializer", return_value=None):
+                    cache.clear()
+                    slow = self.client.get(url)
+                self.assertEqual(fast.status_code, 200, url)
+                self.assertEqual(fast.content, slow.content, url)
+                self.assertNotIn("id", fast.data["results"][0])
+                url, pages = fast.data["next"], pages + 1
+            self.assertEqual(pages, 3)
+
+    def test_nested_serializers_fall_back(self):
+        self.assertIsNone(fastpath.compile_serializer(CompanyDetailSerializer))
+        self.assertIsNotNone(fastpath.compile_serializer(CompanyDetailSerializer, ("id", "name")))
+
+
+class ConditionalRequestTests(CoreAPITestCase):
+    def get(self, url, etag=None):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag) if etag else self.client.get(url)
+
+    def test_not_modified_without_running_the_list(self):
+        self.create_employees(3)
+        url = "/api/employees/?page=1"
+        first = self.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertRegex(first["ETag"], r'^"[0-9a-f]{32}"$')
+        self.assertIn("Last-Modified", first)
+        self.assertIn("no-cache", first["Cache-Control"])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get(url, first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.content, b"")
+        # Only the version lookup; no count, page or related rows.
+        self.assertEqual([q["sql"] for q in ctx.captured_queries if "core_tableversion" not in q["sql"]], [])
+        self.assertNotEqual(self.get("/api/employees/?page=1&status=HIRED")["ETag"], first["ETag"])
+
+    def test_writes_change_the_etag(self):
+        employee = self.create_employees(2)[0]
+        urls = ["/api/companies/", f"/api/companies/{self.company.pk}/", "/api/departments/",
+                f"/api/employees/{employee.pk}/", "/api/employees/"]
+        writes = [
+            lambda: self.client.patch(f"/api/employees/{employee.pk}/", {"designation": "Lead"}),
+            lambda: self.client.patch(f"/api/companies/{self.company.pk}/", {"name": "Acme Corp"}),
+            lambda: self.client.post("/api/employees/bulk/", [{
+                "company": self.company.pk, "department": self.department.pk, "name": "Bulk", "email": "bulk@test.com",
+                "mobile": "+15550009999", "designation": "Engineer",
+            }], format="json"),
+        ]
+        # A designation PATCH leaves the company list (names and counts) as it was.
+        affected = [urls[1:2] + urls[3:], urls, urls]
+        for write, changed in zip(writes, affected):
+            etags = {url: self.get(url)["ETag"] for url in urls}
+            self.assertLess(write().status_code, 300)
+            for url in urls:
+                response = self.get(url, etags[url])
+                self.assertEqual(response.status_code, 200 if url in changed else 304, url)
+
+    def test_employee_etag_changes_daily(self):
+        employee = self.create_employees(1)[0]
+        url = f"/api/employees/{employee.pk}/"
+        etag = self.get(url)["ETag"]
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        with mock.patch("django.utils.timezone.localdate", return_value=tomorrow):
+            self.assertEqual(self.get(url, etag).status_code, 200)
+
+    def test_updated_at(self):
+        employee = self.create_employees(1)[0]
+        before = Employee.objects.get(pk=employee.pk).updated_at
+        self.client.post("/api/employees/bulk/?mode=update", [{
+            "company": self.company.pk, "department": self.department.pk, "name": "Renamed", "email": employee.email,
+            "mobile": employee.mobile, "designation": "Engineer",
+        }], format="json")
+        self.assertGreater(Employee.objects.get(pk=employee.pk).updated_at, before)
+
+
+class PrebuiltResponseTests(CoreAPITestCase):
+    def test_status_choices(self):
+        response = self.client.get("/api/employee-status-choices/")
+        self.assertEqual(response.json()[0], {"value": "APPLICATION_RECEIVED", "label": "Application Received"})
+        self.assertEqual(len(response.json()), len(Employee.Status.choices))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn(f"max-age={settings.PREBUILT_MAX_AGE}", response["Cache-Control"])
+        self.assertEqual(self.client.get(response.wsgi_request.path, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/employee-status-choices/").status_code, 401)
+
+    def test_schema_is_built_once(self):
+        prebuilt.warm()
+        with mock.patch("drf_yasg.generators.OpenAPISchemaGenerator.get_schema") as get_schema:
+            for format in ("openapi", "json", "yaml"):
+                response = self.client.get(f"/swagger/?format={format}")
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("public", response["Cache-Control"])
+            for page in ("/swagger/", "/redoc/", "/swagger/"):
+                self.assertEqual(self.client.get(page).status_code, 200)
+        get_schema.assert_not_called()
+        self.assertIn("/api/employees/", json.loads(self.client.get("/swagger/?format=openapi").content)["paths"])
+        self.assertEqual(prebuilt.warm(), {name: 0.0 for name in prebuilt.registry})
+
+
+class JSONAndCompressionTests(CoreAPITestCase):
+    def payload(self):
+        return {
+            "when": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2024, 5, 1),
+            "amount": decimal.Decimal("1.50"),
+            "id": uuid.UUID(int=1),
+            "label": gettext_lazy("Hired"),
+            "text": "caf\u00e9 \u2028 \u2029 \U0001f600",
+            1: [True, None, 1.5, (2, 3)],
+        }
+
+    @skipUnless(jsoncodec.orjson, "orjson is not installed")
+    def test_backends_match_drf(self):
+        expected = JSONRenderer().render(self.payload())
+        self.assertEqual(jsoncodec.StdlibBackend().dumps(self.payload()), expected)
+        self.assertEqual(jsoncodec.OrjsonBackend().dumps(self.payload()), expected)
+        self.assertEqual(jsoncodec.OrjsonBackend().dumps({"big": 2**70}), b'{"big":1180591620717411303424}')
+        for backend in (jsoncodec.StdlibBackend(), jsoncodec.OrjsonBackend()):
+            self.assertEqual(backend.loads(b'{"a":[1,"\\u00e9"]}'), {"a": [1, "\u00e9"]})
+            with self.assertRaises(ValueError):
+                backend.loads(b'{"a":NaN}')
+
+    def test_endpoints(self):
+        self.create_employees(5)
+        response = self.client.get("/api/employees/")
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        response = self.client.post("/api/employees/bulk/", data=b"[{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
+
+    def test_deeply_nested_body_is_rejected(self):
+        # Unauthenticated, and parsed by the login throttle before the view runs.
+        self.client.force_authenticate(user=None)
+        body = b"[" * 200_000 + b"]" * 200_000
+        backends = [jsoncodec.StdlibBackend()] + ([jsoncodec.OrjsonBackend()] if jsoncodec.orjson else [])
+        for backend in backends:
+            with mock.patch.object(jsoncodec, "backend", backend):
+                response = self.client.post("/api/auth/login/", data=body, content_type="application/json")
+                self.assertEqual(response.status_code, 400, backend.name)
+                self.assertIn("JSON parse error", response.json()["detail"])
+
+    @override_settings(COMPRESSION_ENCODINGS=["br", "gzip"])
+    def test_compression(self):
+        self.create_employees(30)
+        plain = b"".join(self.client.get("/api/employees/all/").streaming_content)
+        encodings = {"gzip": gzip.decompress}
+        if compression.brotli is not None:
+            encodings["br"] = compression.brotli.decompress
+        for encoding, decompress in encodings.items():
+            for url in ("/api/employees/all/", "/api/employees/", "/swagger/?format=openapi"):
+                response = self.client.get(url, HTTP_ACCEPT_ENCODING=f"{encoding}, identity")
+                self.assertEqual(response["Content-Encoding"], encoding, url)
+                self.assertIn("Accept-Encoding", response["Vary"])
+                body = b"".join(response.streaming_content) if response.streaming else response.content
+                if url.endswith("/all/"):
+                    self.assertEqual(decompress(body), plain)
+                else:
+                    json.loads(decompress(body))
+        response = self.client.get("/api/employees/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(response["ETag"].startswith("W/"))
+        self.assertEqual(self.client.get("/api/employees/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        # Below COMPRESSION_MIN_BYTES, refused, or not asked for: sent as is.
+        for url, accept in [("/api/employee-status-choices/", "gzip"), ("/api/employees/", "gzip;q=0"), ("/api/employees/", "")]:
+            self.assertNotIn("Content-Encoding", self.client.get(url, HTTP_ACCEPT_ENCODING=accept), url)
+
+
+class AsyncReadTests(CoreAPITestCase):
+    """The /api/async/ views must answer exactly like their DRF counterparts."""
+
+    urls = [
+        "/api/companies/",
+        "/api/companies/{company}/",
+        "/api/departments/?company={company}",
+        "/api/departments/{department}/",
+        "/api/employees/?page=2",
+        "/api/employees/?page=last",
+        "/api/employees/?page=9",
+        "/api/employees/?status=HIRED",
+        "/api/employees/?company=999",
+        "/api/employees/?search=employee 1",
+        "/api/employees/?fields=id,name,company_name",
+        "/api/employees/?cursor=",
+        "/api/employees/{employee}/",
+        "/api/employees/999999/",
+        "/api/employee-status-choices/",
+        "/api/dashboard-stats/",
+    ]
+
+    def test_responses_match_the_sync_views(self):
+        employee = self.create_employees(15)[0]
+        ids = {"company": self.company.pk, "department": self.department.pk, "employee": employee.pk}
+        for url in self.urls:
+            url = url.format(**ids)
+            expected = self.client.get(url)
+            response = self.client.get(url.replace("/api/", "/api/async/", 1))
+            self.assertEqual(response.status_code, expected.status_code, url)
+            # Pagination links point at the async route itself.
+            self.assertEqual(response.content, expected.content.replace(b"/api/", b"/api/async/"), url)
+
+    def test_authentication_and_permissions(self):
+        self.client.logout()
+        response = self.client.get("/api/async/employees/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], self.client.get("/api/employees/")["WWW-Authenticate"])
+        employee = User.objects.create_user(email="employee@test.com", password="test", role=User.Role.EMPLOYEE)
+        self.client.force_authenticate(user=employee)
+        self.assertEqual(self.client.get("/api/async/employees/").status_code, 403)
+        self.assertEqual(self.client.get("/api/async/companies/").status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(CoreAPITestCase):
+    """
+    The replica is a second SQLite file that deliberately diverges from the
+    primary, so every response shows which database served it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Registered and created for this class only, so no other test (nor the runner's setup and
+        # checks, which is why it is not in the class-level ``databases``) sees a "replica" alias.
+        connections.settings["replica"] = {
+            **connections.settings["default"],
+            "TEST": {
+                **connections.settings["default"]["TEST"],
+                "NAME": str(Path(tempfile.gettempdir()) / f"employee_mgmt_replica_{os.getpid()}.sqlite3"),
+            },
+        }
+        name = connections.settings["replica"]["NAME"]
+        connections["replica"].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.addClassCleanup(cls.remove_replica, name)
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls, name):
+        connections["replica"].creation.destroy_test_db(name, verbosity=0)
+        del connections["replica"]
+        del connections.settings["replica"]
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.replica_company = Company.objects.using("replica").create(name="Replica Co")
+
+    def company_names(self, url="/api/companies/"):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            return [row["name"] for row in json.loads(b"".join(response.streaming_content))]
+        return [row["name"] for row in response.data["results"]]
+
+    def test_reads_go_to_the_replica(self):
+        self.assertEqual(self.company_names(), ["Replica Co"])
+        self.assertEqual(self.company_names("/api/companies/all/"), ["Replica Co"])
+        self.assertEqual(self.client.get(f"/api/companies/{self.replica_company.pk}/").data["name"], "Replica Co")
+        self.assertEqual(self.client.get("/api/dashboard-stats/").data["stats"]["companies"], 1)
+        self.assertEqual(self.client.get("/api/employees/export/").status_code, 200)  # not replica-routed
+
+    def test_writes_go_to_the_primary_and_pin_the_user(self):
+        response = self.client.post("/api/companies/", {"name": "Globex"})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Company.objects.using("default").filter(name="Globex").exists())
+        self.assertFalse(Company.objects.using("replica").filter(name="Globex").exists())
+        # Read-your-writes: this user now reads from the primary until the pin expires.
+        self.assertEqual(self.company_names(), ["Globex", "Acme"])
+        cache.clear()
+        self.assertEqual(self.company_names(), ["Replica Co"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self):
+        self.assertEqual(self.company_names(), ["Acme"])
+
+
+class AdminTests(CoreAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser(email="root@test.com", password="test"))
+
+    def urls(self):
+        employee = Employee.objects.first()
+        return [
+            "/admin/core/company/",
+            "/admin/core/department/",
+            "/admin/core/employee/",
+            f"/admin/core/employee/?company__id__exact={self.company.pk}",
+            f"/admin/core/employee/?department__id__exact={self.department.pk}&status__exact=APPLICATION_RECEIVED",
+            "/admin/core/employee/?q=employee",
+            f"/admin/core/company/{self.company.pk}/change/",
+            f"/admin/core/department/{self.department.pk}/change/",
+            f"/admin/core/employee/{employee.pk}/change/",
+            "/admin/autocomplete/?app_label=core&model_name=employee&field_name=department&term=eng",
+        ]
+
+    def query_counts(self):
+        counts = []
+        for url in self.urls():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200, url)
+            counts.append(len(queries))
+        return counts
+
+    def test_queries_per_page_do_not_grow_with_rows(self):
+        self.create_employees(5)
+        self.query_counts()  # fills per-process caches (content types) first
+        small = self.query_counts()
+        for i in range(3):
+            department = Department.objects.create(company=Company.objects.create(name=f"Other {i}"), name=f"Sales {i}")
+            self.create_employees(10, department=department, start=100 * (i + 1))
+        self.create_employees(40, start=1000)
+        self.assertEqual(self.query_counts(), small)
+        self.assertLessEqual(max(small), 8, small)
+
+    def test_employee_counts_come_from_the_counters(self):
+        self.create_employees(30)
+        for url, expected in [
+            ("/admin/core/employee/", 30),
+            (f"/admin/core/employee/?department__id__exact={self.department.pk}", 30),
+            ("/admin/core/employee/?status__exact=HIRED", 0),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.context["cl"].result_count, expected, url)
+            counted = any('FROM "core_employee"' in q["sql"] and "COUNT(" in q["sql"] for q in queries.captured_queries)
+            self.assertEqual(counted, "status" in url, url)
+
+    def test_inline_is_capped_and_saves(self):
+        self.create_employees(30)
+        url = f"/admin/core/department/{self.department.pk}/change/"
+        formset = self.client.get(url).context["inline_admin_formsets"][0].formset
+        self.assertEqual(len(formset.initial_forms), admin.INLINE_MAX_ROWS)
+        data = {
+            "name": self.department.name,
+            "company": self.company.pk,
+            f"{formset.prefix}-TOTAL_FORMS": len(formset.initial_forms) + 1,
+            f"{formset.prefix}-INITIAL_FORMS": len(formset.initial_forms),
+        }
+        for form in formset.initial_forms:
+            data.update({f"{form.prefix}-{name}": value or "" for name, value in form.initial.items()})
+            data.update({f"{form.prefix}-id": form.instance.pk, f"{form.prefix}-department": self.department.pk})
+        new = f"{formset.prefix}-{len(formset.initial_forms)}"
+        data.update({
+            f"{new}-name": "Newcomer", f"{new}-email": "newcomer@test.com", f"{new}-mobile": "+15550009999",
+            f"{new}-designation": "Engineer", f"{new}-status": "HIRED", f"{new}-department": self.department.pk,
+        })
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        newcomer = Employee.objects.get(email="newcomer@test.com")
+        self.assertEqual((newcomer.company_id, newcomer.department_id), (self.company.pk, self.department.pk))
+        self.assertEqual(Employee.objects.count(), 31)
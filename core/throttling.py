@@ -0,0 +1,26 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginIPThrottle(SimpleRateThrottle):
+    """
+    Login attempts per client IP; runs before the credentials are hashed. The IP
+    comes from ``get_ident()``, which reads X-Forwarded-For only as far as
+    ``REST_FRAMEWORK["NUM_PROXIES"]`` allows.
+    """
+
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginAccountThrottle(SimpleRateThrottle):
+    """Login attempts per submitted email, so a distributed flood on one account is also capped."""
+
+    scope = "login_account"
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not email:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": str(email).strip().lower()}
@@ -1,17 +1,34 @@
+import time
+
 from rest_framework import viewsets, permissions, views, status, generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from django.http import StreamingHttpResponse
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.db.models import ProtectedError
 from .models import Company, Department, Employee
 from .serializers import (
     CompanySerializer, DepartmentSerializer, EmployeeSerializer, CompanyDetailSerializer, DepartmentDetailSerializer,
 )
 from .permissions import IsAdmin, IsManager, IsEmployee
+from .pagination import PageOrCursorPagination
+from .streaming import CSVRenderer, StreamAllMixin, csv_stream
+from .parsers import FastJSONParser, NDJSONParser
+from .bulk import BULK_MAX_ROWS, EmployeeBulkLoader
+from .search import EmployeeSearchFilter
+from .replicas import ReplicaReadMixin
+from .conditional import ConditionalGetMixin
+from .sparse import SparseFieldsetMixin
+from .fastpath import FastListMixin
+from . import dashboard, jsoncodec, prebuilt
 
 # --- Custom JWT Login View ---
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .jwt_serializers import CustomTokenObtainPairSerializer
+from .throttling import LoginAccountThrottle, LoginIPThrottle
 
 
 from rest_framework.permissions import AllowAny
@@ -20,15 +37,17 @@ from rest_framework.permissions import AllowAny
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginAccountThrottle]
 
 
-from django.db.models import Count
 
+class CompanyViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, StreamAllMixin,
+                     viewsets.ModelViewSet):
+    version_models = {"list": [Company], "retrieve": [Company, Department, Employee]}
 
-class CompanyViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' and self.wants('departments'):
             # Prefetch related departments and their employees to prevent N+1 queries
             return queryset.prefetch_related('department_set__employee_set')
         return queryset
@@ -38,11 +57,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
             return CompanyDetailSerializer
         return CompanySerializer
     
-    queryset = Company.objects.annotate(
-        _num_departments=Count("department", distinct=True),
-        _num_employees=Count("employee", distinct=True)
-    ).order_by("-id")
+    queryset = Company.objects.all()
     serializer_class = CompanySerializer
+    pagination_class = PageOrCursorPagination
 
     def get_permissions(self):
         """
@@ -54,12 +71,6 @@ class CompanyViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdmin]
         return [permission() for permission in permission_classes]
 
-    @action(detail=False, methods=["get"])
-    def all(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
@@ -67,12 +78,18 @@ class CompanyViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ValidationError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ProtectedError as e:
+            # Rows still reference it although the counters said otherwise (e.g. before `manage.py recount`).
+            return Response({"detail": e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+
 
+class DepartmentViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, StreamAllMixin,
+                     viewsets.ModelViewSet):
+    version_models = {"list": [Department, Company], "retrieve": [Department, Company, Employee]}
 
-class DepartmentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
-        if self.action == 'retrieve':
+        if self.action == 'retrieve' and self.wants('employees'):
             # Prefetch related employees to prevent N+1 queries
             return queryset.prefetch_related('employee_set')
         return queryset
@@ -84,6 +101,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
 
     queryset = Department.objects.select_related("company").all()
     serializer_class = DepartmentSerializer
+    pagination_class = PageOrCursorPagination
     filterset_fields = ["company"]
 
     def get_permissions(self):
@@ -96,12 +114,6 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             permission_classes = [IsManager | IsAdmin]
         return [permission() for permission in permission_classes]
 
-    @action(detail=False, methods=["get"])
-    def all(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
@@ -109,37 +121,64 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_204_NO_CONTENT)
         except ValidationError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ProtectedError as e:
+            # Rows still reference it although the counters said otherwise (e.g. before `manage.py recount`).
+            return Response({"detail": e.args[0]}, status=status.HTTP_400_BAD_REQUEST)
 
-    def perform_update(self, serializer):
-        try:
-            instance = serializer.save()
-            instance.full_clean()  # This calls the model's clean() method
-        except ValidationError as e:
-            # Convert Django ValidationError to DRF ValidationError
-            from rest_framework.exceptions import ValidationError as DRFValidationError
 
-            if hasattr(e, "message_dict"):
-                raise DRFValidationError(e.message_dict)
-            else:
-                raise DRFValidationError({"detail": str(e)})
-
-
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, StreamAllMixin,
+                     viewsets.ModelViewSet):
     permission_classes = [IsManager]
+    version_models = {"list": [Employee, Company, Department], "retrieve": [Employee, Company, Department]}
+    changes_daily = True  # days_employed
     queryset = Employee.objects.select_related("company", "department").all()
     serializer_class = EmployeeSerializer
+    pagination_class = PageOrCursorPagination
+    filterset_fields = ["company", "department", "status"]
+    filter_backends = api_settings.DEFAULT_FILTER_BACKENDS + [EmployeeSearchFilter]
+
+    @action(detail=False, methods=["get"], renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [CSVRenderer])
+    def export(self, request):
+        """Stream the (filtered) employee list as CSV with the same columns as the API."""
+        queryset = self.filter_queryset(self.get_queryset())
+        header = list(self.get_serializer_class()(context=self.get_serializer_context()).fields)
+        rows = self.serialized_rows(queryset)
+        response = StreamingHttpResponse(csv_stream(header, rows, label="employees"), content_type="text/csv")
+        response["Content-Disposition"] = 'attachment; filename="employees.csv"'
+        return response
+
+    @action(detail=False, methods=["post"], parser_classes=[FastJSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Create, update or upsert (the default, `?mode=`) employees from a JSON array or NDJSON body.
+        Rows are matched by email; valid rows are written and invalid ones reported by index.
+        """
+        rows = request.data
+        mode = request.query_params.get("mode", "upsert")
+        if not isinstance(rows, list):
+            return Response({"detail": "Expected a JSON array or NDJSON of employee objects."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > BULK_MAX_ROWS:
+            return Response({"detail": f"At most {BULK_MAX_ROWS} rows per request."}, status=status.HTTP_400_BAD_REQUEST)
+        if mode not in EmployeeBulkLoader.MODES:
+            return Response({"detail": f"mode must be one of: {', '.join(EmployeeBulkLoader.MODES)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            result = EmployeeBulkLoader(rows, mode).run()
+        except IntegrityError as e:
+            # A concurrent write took an email/mobile/name between validation and insert
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(result)
+
 
-    @action(detail=False, methods=["get"])
-    def all(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+STATUS_CHOICES = prebuilt.register(
+    "employee-status-choices",
+    lambda: jsoncodec.dumps([{"value": value, "label": label} for value, label in Employee.Status.choices]),
+)
 
 
 class EmployeeStatusChoicesView(views.APIView):
     def get(self, request, *args, **kwargs):
-        choices = Employee.Status.choices
-        return Response([{"value": choice[0], "label": choice[1]} for choice in choices])
+        # Fixed per deploy: rendered once per process (core/prebuilt.py).
+        return STATUS_CHOICES.response(request)
 
     permission_classes = [IsEmployee | IsManager | IsAdmin]
 
@@ -147,32 +186,15 @@ class EmployeeStatusChoicesView(views.APIView):
 
 
 
-class DashboardStatsView(views.APIView):
+class DashboardStatsView(ReplicaReadMixin, views.APIView):
     permission_classes = [IsAuthenticated]
+    replica_actions = ["get"]
 
     def get(self, request, *args, **kwargs):
-        # Aggregate data for stats cards
-        company_count = Company.objects.count()
-        department_count = Department.objects.count()
-        employee_count = Employee.objects.count()
-
-        # Aggregate data for charts
-        employees_per_company = Company.objects.annotate(
-            employee_count=Count('employee')).filter(employee_count__gt=0).values('name', 'employee_count')
-
-        departments_per_company = Company.objects.annotate(
-            department_count=Count('department')).filter(department_count__gt=0).values('name', 'department_count')
-
-        # Combine all data into a single response
-        response_data = {
-            'stats': {
-                'companies': company_count,
-                'departments': department_count,
-                'employees': employee_count,
-            },
-            'chart_data': {
-                'employees_per_company': list(employees_per_company),
-                'departments_per_company': list(departments_per_company),
-            }
-        }
-        return Response(response_data)
+        # Served from a cached snapshot that core.signals invalidates on relevant writes
+        response_data, built_at, hit = dashboard.get_snapshot()
+        response = Response(response_data)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        response["X-Cache-Age"] = str(int(time.time() - built_at))
+        response["X-Cache-Hit-Rate"] = f"{dashboard.hit_rate():.3f}"
+        return response
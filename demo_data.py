@@ -86,8 +86,10 @@ def populate():
                 "is_superuser": data['is_superuser'],
             }
         )
-        user.set_password("test")
-        user.save()
+        # Hashing is deliberately slow; only set the password for new users (or ones without a usable one).
+        if created or not user.has_usable_password():
+            user.set_password("test")
+            user.save(update_fields=["password"])
         status_msg = "created" if created else "updated"
         print(f"User {user.email} ({user.role}) {status_msg} with password 'test'.")
     print("Demo data population complete.")
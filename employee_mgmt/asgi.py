@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "employee_mgmt.settings")
 
 application = get_asgi_application()
+
+# Render the build-once responses (OpenAPI schema, status choices) before the first request; logs the timings.
+from core import prebuilt  # noqa: E402
+
+prebuilt.warm()
@@ -53,6 +53,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    # Compresses the final body, so it wraps everything below that may still change it.
+    "core.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,12 +93,126 @@ CORS_ALLOWED_ORIGINS = [
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DB_ENGINE=postgresql needs psycopg (pip install "psycopg[binary]"); SQLite is the default.
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "employee_mgmt"),
+            "USER": os.environ.get("DB_USER", "postgres"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # Take the write lock at BEGIN so concurrent writers queue on busy_timeout instead of
+                # failing with "database is locked" when a read transaction tries to upgrade.
+                "transaction_mode": os.environ.get("SQLITE_TRANSACTION_MODE", "IMMEDIATE"),
+                "timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000,
+            },
+        }
+    }
+
+# Keep connections open between requests (seconds; 0 closes after each request), checked before reuse.
+# Not under ASGI (SERVER_MODE=asgi, gunicorn.conf.py): Django advises against persistent connections there,
+# as each request's sync_to_async thread may open its own and they are not reliably closed.
+DATABASES["default"]["CONN_MAX_AGE"] = (
+    0 if os.environ.get("SERVER_MODE") == "asgi" else int(os.environ.get("DB_CONN_MAX_AGE", 60))
+)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replicas: comma-separated hosts (PostgreSQL) or database files (SQLite) holding copies of the
+# primary. core.replicas.PrimaryReplicaRouter sends list/retrieve/all/dashboard reads to them.
+DATABASE_REPLICAS = []
+for index, location in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(",")), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST" if DB_ENGINE == "postgresql" else "NAME": location.strip(),
+        "TEST": {"MIRROR": "default"},
     }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["core.replicas.PrimaryReplicaRouter"]
+# After a write, the user's reads stay on the primary this long so they see their own changes
+# despite replication lag. Pins live in the cache: set CACHE_DIR so every worker sees them.
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+# SQLite pragmas applied to every new connection by core.signals.configure_sqlite.
+# SQLITE_PROFILE=default leaves SQLite's own defaults (rollback journal, synchronous=FULL).
+SQLITE_PROFILES = {
+    "tuned": {
+        # Readers no longer block the writer, and vice versa.
+        "journal_mode": "WAL",
+        # Safe with WAL: a power loss can drop the last commits but not corrupt the database.
+        "synchronous": "NORMAL",
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_KIB", 64 * 1024)),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_BYTES", 256 * 1024 * 1024)),
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "temp_store": "MEMORY",
+    },
+    "default": {
+        "journal_mode": "DELETE",
+    },
 }
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "tuned")
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per-process; set CACHE_DIR to share the cache (and its invalidations) between workers.
+
+if os.environ.get("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "employee-mgmt",
+        }
+    }
+
+# Browser max-age (seconds) for the build-once responses in core/prebuilt.py (status choices, OpenAPI
+# schema). They only change with a deploy; the ETag lets clients revalidate after that.
+PREBUILT_MAX_AGE = int(os.environ.get("PREBUILT_MAX_AGE", 24 * 60 * 60))
+
+
+# JSON and compression
+# JSON_BACKEND: "orjson" (falls back to the standard library if it is not installed) or "stdlib".
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "orjson")
+# core.compression.CompressionMiddleware: encodings in order of preference ("br" needs the brotli
+# package; empty disables compression) and the smallest body worth compressing.
+COMPRESSION_ENCODINGS = [name.strip() for name in os.environ.get("COMPRESSION_ENCODINGS", "br,gzip").split(",") if name.strip()]
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", 1024))
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# PASSWORD_PBKDF2_ITERATIONS sets the login CPU cost (Django's default is 1,000,000; OWASP's floor for
+# PBKDF2-SHA256 is 600,000). Stored hashes are rehashed to the new cost on each user's next login.
+
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", 1_000_000))
+
+PASSWORD_HASHERS = [
+    "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
 
 
 # Password validation
@@ -151,11 +267,27 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 # Django REST Framework configuration for JWT
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
+    # Stateless: request.user is built from the token claims (no user query); see core/authentication.py
+    "DEFAULT_AUTHENTICATION_CLASSES": ("core.authentication.StatelessJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # JSON through core.jsoncodec (orjson when installed); see JSON_BACKEND.
+    "DEFAULT_RENDERER_CLASSES": ["core.renderers.FastJSONRenderer", "rest_framework.renderers.BrowsableAPIRenderer"],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # Login throttles (core/throttling.py) reject floods before any password hashing.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("LOGIN_IP_RATE", "30/min"),
+        "login_account": os.environ.get("LOGIN_ACCOUNT_RATE", "10/min"),
+    },
+    # Reverse proxies in front of the app. With 0, throttles key on REMOTE_ADDR and ignore a
+    # client-supplied X-Forwarded-For; set it to the proxy count so the real client IP is used.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
 }
 
 # SimpleJWT settings (optional: adjust as needed)
@@ -15,22 +15,63 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from functools import lru_cache
+
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework import permissions
+from rest_framework.response import Response
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer
+
+from core import prebuilt
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Employee Management System API",
-        default_version="v1",
-        description="API documentation for EMS",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
+API_INFO = openapi.Info(
+    title="Employee Management System API",
+    default_version="v1",
+    description="API documentation for EMS",
 )
 
+
+@lru_cache(maxsize=None)
+def build_schema():
+    # Generated once and shared by the JSON and YAML renderings. No request: the schema then has no host/schemes, so clients use the host that served it.
+    return swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO).get_schema(request=None, public=True)
+
+
+def prebuilt_schema(renderer_class):
+    content_type = f"{renderer_class.media_type}; charset={renderer_class.charset}"
+    return prebuilt.register(
+        f"openapi-schema.{renderer_class.format}",
+        lambda: renderer_class().render(build_schema()),
+        content_type=content_type,
+        public=True,
+    )
+
+
+class PrebuiltSchemaView(
+    get_schema_view(API_INFO, public=True, permission_classes=(permissions.AllowAny,))
+):
+    """Serves the JSON/YAML spec from bytes built once per process instead of introspecting every view per request."""
+
+    schemas = {
+        renderer_class.format: prebuilt_schema(renderer_class)
+        for renderer_class in (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+    }
+
+    def get(self, request, version="", format=None):
+        schema = self.schemas.get(request.accepted_renderer.format)
+        if schema is None:
+            # The Swagger UI / ReDoc page itself (it fetches the spec with ?format=openapi), rendered
+            # around the cached schema rather than one drf-yasg would generate for this request.
+            return Response(build_schema())
+        return schema.response(request)
+
+
+schema_view = PrebuiltSchemaView
+
 urlpatterns = [
     path("swagger/", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui"),
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "employee_mgmt.settings")
 
 application = get_wsgi_application()
+
+# Render the build-once responses (OpenAPI schema, status choices) before the first request; logs the timings.
+from core import prebuilt  # noqa: E402
+
+prebuilt.warm()
@@ -0,0 +1,88 @@
+"""
+Gunicorn settings for the production entry mode (``startup.sh serve``).
+
+SERVER_MODE=wsgi (default) runs threaded WSGI workers; SERVER_MODE=asgi runs
+uvicorn workers for employee_mgmt.asgi (and the /api/async/ views). Worker
+counts are sized from the CPUs this container may actually use; override
+them with WEB_CONCURRENCY and GUNICORN_THREADS. The app is imported once in
+the master and forked, so workers start with Django set up, the URLconf
+imported and the prebuilt responses rendered.
+
+Migrations are not run here; they are a separate one-shot ``startup.sh migrate``.
+The default cache must be shared by the workers (``CACHE_DIR``); the server
+will not start on a per-process one.
+"""
+
+import math
+import os
+import time
+
+START = time.perf_counter()
+
+
+def available_cpus():
+    """CPUs in this process's affinity mask, capped by a cgroup v2 CPU quota (``docker run --cpus``)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+CPUS = available_cpus()
+# Cold start (config load to all workers accepting requests) above this many seconds is logged as a warning.
+COLD_START_BUDGET_SECONDS = float(os.environ.get("COLD_START_BUDGET_SECONDS", 5))
+
+bind = os.environ.get("BIND", "0.0.0.0:9000")
+preload_app = True
+if SERVER_MODE == "asgi":
+    wsgi_app = "employee_mgmt.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    # One event loop per core.
+    workers = int(os.environ.get("WEB_CONCURRENCY", CPUS))
+else:
+    wsgi_app = "employee_mgmt.wsgi:application"
+    worker_class = "gthread"
+    workers = int(os.environ.get("WEB_CONCURRENCY", 2 * CPUS + 1))
+    threads = int(os.environ.get("GUNICORN_THREADS", 2))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+# Longer than a typical load balancer idle timeout, so the balancer closes idle connections first.
+keepalive = 75
+accesslog = "-"
+
+
+def on_starting(server):
+    # Token revocations, login throttles, dashboard invalidations and replica pins all live in the default
+    # cache; a per-process one would only reach the worker that wrote it. Refuse to start on one.
+    from django.core import checks
+
+    errors = [
+        error for error in checks.run_checks(tags=[checks.Tags.caches], include_deployment_checks=True)
+        if error.is_serious()
+    ]
+    for error in errors:
+        server.log.error("%s", error)
+    if errors:
+        raise SystemExit(1)
+
+
+def post_fork(server, worker):
+    # Database connections must never be shared across processes; each worker opens its own.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def when_ready(server):
+    server.log.info("Serving %s with %d %s worker(s) on %d CPU(s)", SERVER_MODE, workers, worker_class, CPUS)
+
+
+def post_worker_init(worker):
+    elapsed = time.perf_counter() - START
+    log = worker.log.warning if elapsed > COLD_START_BUDGET_SECONDS else worker.log.info
+    log("Worker %s ready %.2fs after start (budget %.1fs)", worker.pid, elapsed, COLD_START_BUDGET_SECONDS)
@@ -1,24 +1,45 @@
 #!/bin/bash
 set -e
 
-# Marker file to check if setup is done
-SETUP_MARKER=/.setup_done
+# Entry modes:
+#   startup.sh migrate   one-shot: apply migrations, repair counters and the search index (and load demo
+#                        data if LOAD_DEMO_DATA=1), then exit
+#   startup.sh serve     production: gunicorn with gunicorn.conf.py; expects migrations already applied and
+#                        a cache shared by the workers (CACHE_DIR)
+#   startup.sh <cmd...>  development: first-boot setup below, then run <cmd> (the image CMD is runserver)
 
-if [ ! -f "$SETUP_MARKER" ]; then
-    echo "Running initial setup..."
-
-    # Create logs directory
-    echo "Creating logs directory..."
+migrate() {
     mkdir -p logs
-    
-    # Run migrations
     echo "Running migrations..."
     python manage.py makemigrations accounts core
     python manage.py migrate
-    
-    # Load demo data
-    echo "Loading demo data..."
-    python demo_data.py
+    # Databases from before the headcount counters or the search index need both filled in; on an
+    # up-to-date database this only repairs drift.
+    python manage.py recount
+    python manage.py rebuild_search_index
+    if [ "${LOAD_DEMO_DATA:-0}" = "1" ]; then
+        echo "Loading demo data..."
+        python demo_data.py
+    fi
+}
+
+case "$1" in
+    migrate)
+        migrate
+        exit 0
+        ;;
+    serve)
+        mkdir -p logs
+        exec gunicorn --config gunicorn.conf.py
+        ;;
+esac
+
+# Marker file to check if setup is done
+SETUP_MARKER=/.setup_done
+
+if [ ! -f "$SETUP_MARKER" ]; then
+    echo "Running initial setup..."
+    LOAD_DEMO_DATA=1 migrate
     
     # Create marker file
     touch "$SETUP_MARKER"